@@ -1,13 +1,34 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, render_template, request, jsonify, g, Response, stream_with_context
 from chatbot import InternshipChatbot
+from knowledge_base import QUICK_TOPICS
+from metrics import REGISTRY
+import json
 import os
+import uuid
+
+SESSION_COOKIE = 'chat_session_id'
+SESSION_HEADER = 'X-Session-ID'
+MAX_BATCH_ITEMS = 10000
 
 app = Flask(__name__)
 chatbot = InternshipChatbot()
 
+@app.before_request
+def load_session_id():
+    # Prefer an explicit header (API clients), then the browser cookie
+    session_id = request.headers.get(SESSION_HEADER) or request.cookies.get(SESSION_COOKIE)
+    g.new_session = not session_id
+    g.session_id = session_id[:128] if session_id else uuid.uuid4().hex
+
+@app.after_request
+def save_session_id(response):
+    if g.get('new_session'):
+        response.set_cookie(SESSION_COOKIE, g.session_id, httponly=True, samesite='Lax')
+    return response
+
 @app.route('/')
 def index():
-    return render_template('index.html')
+    return render_template('index.html', quick_topics=QUICK_TOPICS)
 
 @app.route('/chat', methods=['POST'])
 def chat():
@@ -26,7 +47,7 @@ def chat():
                 'intent': 'error'
             }), 400
         
-        response = chatbot.get_response(user_message)
+        response = chatbot.get_response(user_message, g.session_id)
         return jsonify(response)
     
     except Exception as e:
@@ -36,10 +57,67 @@ def chat():
             'error': str(e)
         }), 500
 
+@app.route('/chat/stream', methods=['POST'])
+def chat_stream():
+    data = request.get_json(silent=True)
+    user_message = data.get('message', '').strip() if data else ''
+    
+    if not user_message:
+        return jsonify({
+            'response': 'Please enter a message.',
+            'intent': 'error'
+        }), 400
+    
+    session_id = g.session_id
+    
+    def generate():
+        for event, payload in chatbot.stream_response(user_message, session_id):
+            yield f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/chat/batch', methods=['POST'])
+def chat_batch():
+    data = request.get_json(silent=True)
+    messages = data.get('messages') if isinstance(data, dict) else None
+    
+    if not isinstance(messages, list) or not messages:
+        return jsonify({'error': "Expected a non-empty 'messages' list."}), 400
+    if len(messages) > MAX_BATCH_ITEMS:
+        return jsonify({'error': f'At most {MAX_BATCH_ITEMS} messages per batch.'}), 413
+    
+    # One JSON line per message, in completion order
+    def generate():
+        for result in chatbot.batch_responses(messages):
+            yield json.dumps(result) + '\n'
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        headers={'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/reset', methods=['POST'])
 def reset_conversation():
-    chatbot.reset_context()
+    chatbot.reset_context(g.session_id)
     return jsonify({'status': 'success', 'message': 'Conversation reset'})
 
+@app.route('/cache/stats')
+def cache_stats():
+    return jsonify(dict(chatbot.cache.stats(), inflight=chatbot.inflight.stats(), warmup=chatbot.warmer.stats()))
+
+@app.route('/health')
+def health():
+    # The bot keeps answering from the knowledge base while OpenAI is unavailable
+    return jsonify({'status': 'ok', 'openai': chatbot.breaker.stats()})
+
+@app.route('/metrics')
+def metrics():
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -0,0 +1,241 @@
+"""
+ASGI entry point serving the chatbot on an asyncio event loop.
+
+Run with any ASGI server, for example ``uvicorn asgi:app --port 5000``.
+It serves the same routes as the Flask app in app.py (``/``, ``/chat``,
+``/chat/stream``, ``/chat/batch``, ``/reset``, ``/cache/stats``, ``/health``
+and ``/metrics`` plus static files), but OpenAI calls are awaited instead of
+holding a worker thread each. The Flask app remains the simple synchronous deployment option.
+"""
+import json
+import mimetypes
+import os
+import uuid
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from async_chatbot import AsyncInternshipChatbot
+from knowledge_base import QUICK_TOPICS
+from metrics import REGISTRY
+
+SESSION_COOKIE = 'chat_session_id'
+SESSION_HEADER = 'x-session-id'
+MAX_BODY_BYTES = 64 * 1024
+MAX_BATCH_BODY_BYTES = 8 * 1024 * 1024
+MAX_BATCH_ITEMS = 10000
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.realpath(os.path.join(BASE_DIR, 'static'))
+
+templates = Environment(
+    loader=FileSystemLoader(os.path.join(BASE_DIR, 'templates')),
+    autoescape=select_autoescape(['html'])
+)
+# Templates are shared with Flask, which provides url_for
+templates.globals['url_for'] = lambda endpoint, filename: f"/{endpoint}/{filename}"
+
+chatbot = AsyncInternshipChatbot()
+
+
+class RequestTooLarge(ValueError):
+    """
+    Raised when a request body exceeds its size limit
+    """
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    headers = {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope['headers']}
+    session_id = headers.get(SESSION_HEADER) or _cookie(headers.get('cookie', ''), SESSION_COOKIE)
+    new_session = not session_id
+    session_id = session_id[:128] if session_id else uuid.uuid4().hex
+
+    extra_headers = []
+    if new_session:
+        extra_headers.append((b'set-cookie', f"{SESSION_COOKIE}={session_id}; HttpOnly; SameSite=Lax; Path=/".encode('latin-1')))
+
+    method = scope['method']
+    path = scope['path']
+
+    if path == '/' and method == 'GET':
+        body = templates.get_template('index.html').render(quick_topics=QUICK_TOPICS)
+        await _send(send, 200, body.encode('utf-8'), 'text/html; charset=utf-8', extra_headers)
+    elif path.startswith('/static/') and method == 'GET':
+        await _send_static(send, path[len('/static/'):])
+    elif path == '/chat' and method == 'POST':
+        status, payload = await _chat(receive, session_id)
+        await _send_json(send, status, payload, extra_headers)
+    elif path == '/chat/stream' and method == 'POST':
+        await _chat_stream(receive, send, session_id, extra_headers)
+    elif path == '/chat/batch' and method == 'POST':
+        await _chat_batch(receive, send)
+    elif path == '/reset' and method == 'POST':
+        await chatbot.reset_context_async(session_id)
+        await _send_json(send, 200, {'status': 'success', 'message': 'Conversation reset'}, extra_headers)
+    elif path == '/cache/stats' and method == 'GET':
+        await _send_json(send, 200, dict(chatbot.cache.stats(), inflight=chatbot.async_inflight.stats(), warmup=chatbot.warmer.stats()))
+    elif path == '/health' and method == 'GET':
+        await _send_json(send, 200, {'status': 'ok', 'openai': chatbot.breaker.stats()})
+    elif path == '/metrics' and method == 'GET':
+        await _send(send, 200, REGISTRY.render().encode('utf-8'), 'text/plain; version=0.0.4')
+    else:
+        await _send_json(send, 404, {'error': 'Not found'})
+
+
+async def _chat(receive, session_id):
+    try:
+        data = json.loads(await _read_body(receive) or b'null')
+        if not isinstance(data, dict):
+            return 400, {
+                'response': 'Invalid request format.',
+                'intent': 'error'
+            }
+        user_message = str(data.get('message', '')).strip()
+
+        if not user_message:
+            return 400, {
+                'response': 'Please enter a message.',
+                'intent': 'error'
+            }
+
+        return 200, await chatbot.get_response_async(user_message, session_id)
+
+    except RequestTooLarge:
+        return 413, {
+            'response': 'Your message is too long.',
+            'intent': 'error'
+        }
+    except Exception as e:
+        return 500, {
+            'response': 'I apologize, but I encountered an error. Please try again.',
+            'intent': 'error',
+            'error': str(e)
+        }
+
+
+async def _chat_stream(receive, send, session_id, extra_headers):
+    try:
+        data = json.loads(await _read_body(receive) or b'null')
+    except RequestTooLarge:
+        await _send_json(send, 413, {
+            'response': 'Your message is too long.',
+            'intent': 'error'
+        }, extra_headers)
+        return
+    except ValueError:
+        data = None
+    user_message = str(data.get('message', '')).strip() if isinstance(data, dict) else ''
+
+    if not user_message:
+        await _send_json(send, 400, {
+            'response': 'Please enter a message.',
+            'intent': 'error'
+        }, extra_headers)
+        return
+
+    headers = [
+        (b'content-type', b'text/event-stream'),
+        (b'cache-control', b'no-cache'),
+        (b'x-accel-buffering', b'no')
+    ]
+    headers.extend(extra_headers)
+    await send({'type': 'http.response.start', 'status': 200, 'headers': headers})
+    async for event, payload in chatbot.stream_response_async(user_message, session_id):
+        chunk = f"event: {event}\ndata: {json.dumps(payload)}\n\n".encode('utf-8')
+        await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+async def _chat_batch(receive, send):
+    try:
+        data = json.loads(await _read_body(receive, MAX_BATCH_BODY_BYTES) or b'null')
+    except RequestTooLarge:
+        await _send_json(send, 413, {'error': f'Request body exceeds {MAX_BATCH_BODY_BYTES} bytes.'})
+        return
+    except ValueError:
+        data = None
+    messages = data.get('messages') if isinstance(data, dict) else None
+
+    if not isinstance(messages, list) or not messages:
+        await _send_json(send, 400, {'error': "Expected a non-empty 'messages' list."})
+        return
+    if len(messages) > MAX_BATCH_ITEMS:
+        await _send_json(send, 413, {'error': f'At most {MAX_BATCH_ITEMS} messages per batch.'})
+        return
+
+    headers = [
+        (b'content-type', b'application/x-ndjson'),
+        (b'x-accel-buffering', b'no')
+    ]
+    await send({'type': 'http.response.start', 'status': 200, 'headers': headers})
+    # One JSON line per message, in completion order
+    async for result in chatbot.batch_responses_async(messages):
+        line = (json.dumps(result) + '\n').encode('utf-8')
+        await send({'type': 'http.response.body', 'body': line, 'more_body': True})
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+async def _read_body(receive, limit=MAX_BODY_BYTES):
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if len(body) > limit:
+            raise RequestTooLarge('Request body too large')
+        if not message.get('more_body'):
+            return body
+
+
+def _cookie(header, name):
+    """
+    Return one cookie's value from a Cookie header, or None.
+
+    Pieces that are not plain name=value pairs are skipped. http.cookies
+    instead stops at the first one, which loses every cookie after it.
+    """
+    for piece in header.split(';'):
+        key, separator, value = piece.partition('=')
+        if separator and key.strip() == name:
+            return value.strip().strip('"') or None
+    return None
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await chatbot.aclose()
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def _send_static(send, filename):
+    path = os.path.realpath(os.path.join(STATIC_DIR, filename))
+    if not path.startswith(STATIC_DIR + os.sep) or not os.path.isfile(path):
+        await _send_json(send, 404, {'error': 'Not found'})
+        return
+    with open(path, 'rb') as f:
+        body = f.read()
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    await _send(send, 200, body, content_type)
+
+
+async def _send_json(send, status, payload, extra_headers=()):
+    await _send(send, status, json.dumps(payload).encode('utf-8'), 'application/json', extra_headers)
+
+
+async def _send(send, status, body, content_type, extra_headers=()):
+    headers = [
+        (b'content-type', content_type.encode('latin-1')),
+        (b'content-length', str(len(body)).encode('latin-1'))
+    ]
+    headers.extend(extra_headers)
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': body})
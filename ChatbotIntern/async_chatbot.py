@@ -0,0 +1,280 @@
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+from chatbot import InternshipChatbot, DEFAULT_SESSION_ID, STAGE_SECONDS
+from singleflight import AsyncSingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncInternshipChatbot(InternshipChatbot):
+    """
+    asyncio-native variant of InternshipChatbot.
+
+    Routing, the knowledge base, caching and session state are shared with the
+    synchronous bot; only the OpenAI calls are awaited, over one bounded and
+    pooled HTTP connection pool, so a single event loop can hold hundreds of
+    conversations open while they wait on upstream I/O.
+    """
+
+    def __init__(self, single_call=None, warmup_questions=None):
+        super().__init__(single_call=single_call, warmup_questions=warmup_questions)
+        max_connections = int(os.getenv("CHATBOT_MAX_CONNECTIONS", "100"))
+        self.async_client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            base_url=os.getenv("OPENAI_BASE_URL"),
+            timeout=self.generate_timeout,
+            max_retries=self.max_retries,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max(1, max_connections // 2)
+                )
+            )
+        )
+        self.async_inflight = AsyncSingleFlight()
+
+    async def get_response_async(self, user_message, session_id=DEFAULT_SESSION_ID):
+        """
+        Process user message and return appropriate response without blocking the event loop
+        """
+        turn_started = time.perf_counter()
+        with STAGE_SECONDS.time(stage='total'):
+            try:
+                conversation_context, cacheable, intent_result, response = await self._run_state(self._begin_turn, session_id, user_message)
+
+                mode = 'two_call'
+                if intent_result is None:
+                    if self.single_call:
+                        intent_result, response, mode = await self._classify_and_answer_async(user_message, conversation_context)
+                    else:
+                        intent_result = await self._classify_intent_async(user_message)
+
+                branch, response = await self._run_state(self._select_answer, user_message, intent_result, cacheable, response)
+                if response is None and branch == 'contextual':
+                    response = await self._generate_contextual_response_async(user_message, intent_result, conversation_context)
+                elif response is None:
+                    response = self._generate_response(branch, user_message, intent_result, conversation_context)
+
+                await self._run_state(self._finish_turn, session_id, user_message, intent_result, branch, cacheable, response, turn_started, mode)
+                return response
+
+            except Exception:
+                logger.exception("Failed to answer message")
+                return self._error_response()
+
+    async def stream_response_async(self, user_message, session_id=DEFAULT_SESSION_ID):
+        """
+        Process user message and yield (event, data) pairs as the response is produced
+        """
+        turn_started = time.perf_counter()
+        try:
+            conversation_context, cacheable, intent_result, response = await self._run_state(self._begin_turn, session_id, user_message)
+            if intent_result is None:
+                intent_result = await self._classify_intent_async(user_message)
+            yield 'intent', self._intent_event(intent_result)
+
+            streamed = False
+            branch, response = await self._run_state(self._select_answer, user_message, intent_result, cacheable, response)
+            if response is None and branch == 'contextual':
+                chunks = []
+                try:
+                    async for text in self._stream_contextual_async(user_message, intent_result, conversation_context):
+                        chunks.append(text)
+                        yield 'token', {'text': text}
+                except Exception as e:
+                    logger.warning("Response streaming error: %s", e)
+                    if chunks:
+                        # The stream broke part way through; don't cache the partial answer
+                        self.breaker.record_failure()
+                        cacheable = False
+                streamed = bool(chunks)
+                response = self._streamed_response(user_message, intent_result, chunks)
+            elif response is None:
+                response = self._generate_response(branch, user_message, intent_result, conversation_context)
+
+            if not streamed:
+                yield 'token', {'text': response['response']}
+
+            await self._run_state(self._finish_turn, session_id, user_message, intent_result, branch, cacheable, response, turn_started)
+            yield 'done', response
+
+        except Exception:
+            logger.exception("Failed to stream answer")
+            yield 'error', self._error_response()
+
+    async def _stream_contextual_async(self, message, intent_result, conversation_context):
+        messages = self._build_contextual_messages(message, intent_result, conversation_context)
+        started = time.perf_counter()
+        remaining = await self._acquire_upstream_async(self.generate_timeout)
+        stream = await self.breaker.call_async(lambda: self.async_client.chat.completions.create(
+            model="gpt-4o",
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True},
+            timeout=remaining
+        ))
+        first = True
+        async for chunk in stream:
+            text = self._chunk_text(chunk)
+            if text:
+                if first:
+                    STAGE_SECONDS.observe(time.perf_counter() - started, stage='first_token')
+                    first = False
+                yield text
+
+    async def batch_responses_async(self, messages, concurrency=None):
+        """
+        Answer many independent messages concurrently, yielding results as each completes
+        """
+        semaphore = asyncio.Semaphore(concurrency or self.batch_workers)
+
+        async def run(index, message):
+            async with semaphore:
+                return await self._batch_item_async(index, message)
+
+        tasks = [asyncio.ensure_future(run(index, message)) for index, message in enumerate(messages)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Drop queued work if the consumer stops early (e.g. the client disconnected)
+            for task in tasks:
+                task.cancel()
+
+    async def _batch_item_async(self, index, message):
+        started = time.perf_counter()
+        message = str(message).strip()
+        if not message:
+            return self._batch_result(index, message, None, started)
+        session_id = f"batch-{uuid.uuid4().hex}"
+        try:
+            response = await self.get_response_async(message, session_id)
+        finally:
+            await self._run_state(self.sessions.reset, session_id)
+        return self._batch_result(index, message, response, started)
+
+    async def reset_context_async(self, session_id=DEFAULT_SESSION_ID):
+        await self._run_state(self.reset_context, session_id)
+
+    async def _run_state(self, fn, *args):
+        """
+        Call fn(*args), on a worker thread when it may block on SQLite
+        """
+        if self.state_on_disk:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    async def aclose(self):
+        """
+        Close the pooled HTTP connections, stop background warm-up and flush transcripts
+        """
+        self.warmer.close()
+        if self.transcripts is not None:
+            await asyncio.to_thread(self.transcripts.close)
+        await self.async_client.close()
+
+    async def _create_completion_async(self, timeout, **params):
+        """
+        Create a chat completion within a deadline, coalescing identical in-flight requests
+        """
+        key = json.dumps(params, sort_keys=True)
+        return await self.async_inflight.do(
+            key,
+            lambda: self._call_upstream_limited_async(timeout, params),
+            timeout=timeout
+        )
+
+    async def _call_upstream_limited_async(self, timeout, params):
+        remaining = await self._acquire_upstream_async(timeout)
+        return await self.breaker.call_async(lambda: self._call_upstream_async(remaining, params))
+
+    async def _acquire_upstream_async(self, timeout):
+        """
+        Wait for rate limit capacity and return how much of the deadline is left for the call
+        """
+        started = time.perf_counter()
+        await self.upstream_limiter.acquire_async(timeout=timeout)
+        return max(0.0, timeout - (time.perf_counter() - started))
+
+    async def _call_upstream_async(self, timeout, params):
+        with STAGE_SECONDS.time(stage='upstream'):
+            response = await self.async_client.chat.completions.create(timeout=timeout, **params)
+        self._record_usage(getattr(response, 'usage', None))
+        return response
+
+    async def _classify_intent_async(self, message):
+        """
+        Classify user intent locally, escalating to OpenAI and then keyword matching
+        """
+        with STAGE_SECONDS.time(stage='classification'):
+            return await self.intent_router.classify_async(message, self._classify_intent_remote_async)
+
+    async def _classify_intent_remote_async(self, message):
+        """
+        Classify user intent using OpenAI, returning None when it is unavailable
+        """
+        try:
+            response = await self._create_completion_async(
+                timeout=self.classify_timeout,
+                model="gpt-4o",
+                messages=self._build_classification_messages(message),
+                response_format={"type": "json_object"}
+            )
+
+            content = response.choices[0].message.content
+            if not content:
+                return None
+            return json.loads(content)
+
+        except Exception as e:
+            logger.warning("Intent classification error: %s", e)
+            return None
+
+    async def _classify_and_answer_async(self, message, conversation_context):
+        """
+        Classify and answer in a single OpenAI round trip
+        """
+        local_result = self.intent_router.classify_local(message)
+        if local_result is not None:
+            return local_result, None, 'two_call'
+
+        try:
+            response = await self._create_completion_async(
+                timeout=self.generate_timeout,
+                model="gpt-4o",
+                messages=self._build_single_call_messages(message, conversation_context),
+                response_format={"type": "json_object"}
+            )
+            return self._parse_single_call(message, response.choices[0].message.content)
+
+        except Exception as e:
+            logger.warning("Single-call response error: %s", e)
+            return self.intent_router.classify_fallback(message), None, 'two_call'
+
+    async def _generate_contextual_response_async(self, message, intent_result, conversation_context):
+        """
+        Generate response based on classified intent and knowledge base
+        """
+        intent = intent_result.get('intent', 'general_info')
+
+        try:
+            response = await self._create_completion_async(
+                timeout=self.generate_timeout,
+                model="gpt-4o",
+                messages=self._build_contextual_messages(message, intent_result, conversation_context)
+            )
+
+            return self._contextual_response(intent_result, response.choices[0].message.content)
+
+        except Exception as e:
+            logger.warning("Response generation error: %s", e)
+            # Use knowledge base directly when OpenAI is unavailable
+            return self._generate_knowledge_base_response(intent, message)
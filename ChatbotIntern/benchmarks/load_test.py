@@ -0,0 +1,154 @@
+"""
+Load generator for the chatbot's /chat endpoint.
+
+Replays a weighted mix of sidebar questions, free-text questions and
+greetings at each concurrency level, then reports latency percentiles,
+throughput and error rate per answering code path: the ``source`` field of
+each response (contextual, knowledge_base, fallback or error), with answers
+served from the response cache or warm-up set grouped separately as cache.
+
+    python benchmarks/load_test.py --url http://127.0.0.1:5000 --concurrency 1,8,32 --requests 200
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from knowledge_base import QUICK_TOPICS
+
+FREE_TEXT = [
+    "How do I write a good internship application?",
+    "What should I expect in a technical interview?",
+    "Are there internships available for freshmen?",
+    "How can I find remote internship opportunities?",
+    "What's the typical internship timeline for summer programs?",
+    "Do companies help with housing for interns?",
+    "Is a 2.8 GPA too low for a software internship?",
+    "How many internships should I apply to?",
+    "What do interns usually wear on the first day?",
+    "Can international students get paid internships?"
+]
+
+GREETINGS = ["Hello", "Hi there", "Hey!", "Good morning", "Thanks, bye"]
+
+MESSAGE_SETS = {
+    'sidebar': [topic['question'] for topic in QUICK_TOPICS],
+    'free': FREE_TEXT,
+    'greeting': GREETINGS
+}
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        name, weight = part.split('=')
+        if name not in MESSAGE_SETS:
+            raise ValueError(f"Unknown message set '{name}'; choose from {', '.join(MESSAGE_SETS)}")
+        mix[name] = float(weight)
+    return mix
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def send_chat(url, message, session_id, timeout):
+    request = urllib.request.Request(
+        url.rstrip('/') + '/chat',
+        data=json.dumps({'message': message}).encode('utf-8'),
+        headers={'Content-Type': 'application/json', 'X-Session-ID': session_id},
+        method='POST'
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            payload = json.loads(response.read())
+        # Cache and warm-up hits keep their original source; keep them out of the LLM-path numbers
+        source = 'cache' if payload.get('cached') else payload.get('source', 'unknown')
+    except urllib.error.HTTPError as e:
+        source = 'error'
+        e.close()
+    except Exception:
+        source = 'error'
+    return source, time.perf_counter() - start
+
+
+def run_level(url, concurrency, total_requests, mix, timeout, seed):
+    rng = random.Random(seed)
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    plan = [rng.choice(MESSAGE_SETS[name]) for name in rng.choices(names, weights, k=total_requests)]
+
+    results = []
+    lock = threading.Lock()
+    cursor = iter(range(total_requests))
+
+    def worker():
+        # Each virtual user keeps its own conversation
+        session_id = uuid.uuid4().hex
+        while True:
+            with lock:
+                index = next(cursor, None)
+            if index is None:
+                return
+            outcome = send_chat(url, plan[index], session_id, timeout)
+            with lock:
+                results.append(outcome)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, time.perf_counter() - started
+
+
+def report(concurrency, results, elapsed):
+    by_source = defaultdict(list)
+    for source, latency in results:
+        by_source[source].append(latency)
+        by_source['all'].append(latency)
+
+    errors = len(by_source.get('error', []))
+    print(f"\nconcurrency={concurrency} requests={len(results)} "
+          f"throughput={len(results) / elapsed:.1f} req/s error_rate={errors / max(1, len(results)):.2%}")
+    print(f"  {'path':<16}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for source in sorted(by_source, key=lambda name: (name == 'all', name)):
+        latencies = sorted(by_source[source])
+        print(f"  {source:<16}{len(latencies):>7}"
+              f"{percentile(latencies, 0.50) * 1000:>10.1f}"
+              f"{percentile(latencies, 0.95) * 1000:>10.1f}"
+              f"{percentile(latencies, 0.99) * 1000:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--concurrency', default='1,8,32', help='comma-separated concurrency levels')
+    parser.add_argument('--requests', type=int, default=200, help='requests per concurrency level')
+    parser.add_argument('--mix', default='sidebar=0.6,free=0.3,greeting=0.1', help='weighted message mix')
+    parser.add_argument('--timeout', type=float, default=60.0)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    for concurrency in (int(level) for level in args.concurrency.split(',')):
+        results, elapsed = run_level(args.url, concurrency, args.requests, mix, args.timeout, args.seed)
+        report(concurrency, results, elapsed)
+
+
+if __name__ == '__main__':
+    main()
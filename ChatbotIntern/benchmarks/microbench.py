@@ -0,0 +1,92 @@
+"""
+Microbenchmarks for the local hot paths that run on every message.
+
+Times the keyword fallback classifier, FAQ search and FAQ lookup without
+any network access. Save a baseline, then compare later runs against it to
+catch regressions:
+
+    python benchmarks/microbench.py --save baseline.json
+    python benchmarks/microbench.py --compare baseline.json --tolerance 0.25
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# The OpenAI client is constructed but never called here
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+os.environ.setdefault("CHATBOT_WARMUP", "0")
+
+from chatbot import InternshipChatbot
+
+MESSAGES = [
+    "How do I apply for internships?",
+    "what is the interview process like for a summer internship at a big tech company?",
+    "Are internships paid and do they come with housing benefits or a stipend?",
+    "hi",
+    "Tell me something completely unrelated to careers, like the weather in Paris this week."
+]
+
+INTENTS = ['application_process', 'timeline', 'greeting', 'unknown_intent']
+
+
+def bench(fn, inputs, repeat, number):
+    def run():
+        for value in inputs:
+            fn(value)
+    # Best of several repeats, reported per call
+    best = min(timeit.repeat(run, repeat=repeat, number=number))
+    return best / (number * len(inputs)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--number', type=int, default=2000)
+    parser.add_argument('--save', help='write results to this JSON file')
+    parser.add_argument('--compare', help='compare against a saved JSON baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown before failing (0.25 = 25%%)')
+    args = parser.parse_args()
+
+    chatbot = InternshipChatbot()
+    knowledge_base = chatbot.knowledge_base
+    benchmarks = {
+        '_classify_intent_fallback': (chatbot._classify_intent_fallback, MESSAGES),
+        'search_faqs': (knowledge_base.search_faqs, MESSAGES),
+        'get_faq_by_intent': (knowledge_base.get_faq_by_intent, INTENTS)
+    }
+
+    results = {}
+    for name, (fn, inputs) in benchmarks.items():
+        results[name] = bench(fn, inputs, args.repeat, args.number)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    regressions = []
+    print(f"{'benchmark':<28}{'us/call':>10}{'baseline':>10}{'change':>9}")
+    for name, micros in results.items():
+        line = f"{name:<28}{micros:>10.2f}"
+        if name in baseline:
+            change = micros / baseline[name] - 1
+            line += f"{baseline[name]:>10.2f}{change:>+9.0%}"
+            if change > args.tolerance:
+                regressions.append(name)
+        print(line)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if regressions:
+        print(f"Regressions beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
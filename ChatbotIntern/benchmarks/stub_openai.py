@@ -0,0 +1,138 @@
+"""
+OpenAI-compatible stub server for load testing.
+
+Serves ``POST /v1/chat/completions`` (plain, JSON-mode and streaming) with
+configurable latency, jitter and error rate. Point the chatbot at it with
+``OPENAI_BASE_URL=http://127.0.0.1:8001/v1 OPENAI_API_KEY=stub``.
+
+    python benchmarks/stub_openai.py --port 8001 --latency 0.8 --jitter 0.3 --error-rate 0.02
+"""
+import argparse
+import json
+import random
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STUB_ANSWER = (
+    "Most internship programs look for a strong resume, relevant coursework and "
+    "a clear interest in the field. Apply early and tailor each application."
+)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    latency = 0.5
+    jitter = 0.1
+    error_rate = 0.0
+    chunk_delay = 0.02
+
+    def do_POST(self):
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send_json(404, {'error': {'message': 'Not found'}})
+            return
+
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length) or b'{}')
+        time.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+
+        if random.random() < self.error_rate:
+            self._send_json(500, {'error': {'message': 'Injected stub failure', 'type': 'server_error'}})
+            return
+
+        content = self._content_for(request)
+        if request.get('stream'):
+            self._send_stream(request, content)
+        else:
+            self._send_json(200, {
+                'id': f"chatcmpl-{uuid.uuid4().hex}",
+                'object': 'chat.completion',
+                'created': int(time.time()),
+                'model': request.get('model', 'stub'),
+                'choices': [{
+                    'index': 0,
+                    'message': {'role': 'assistant', 'content': content},
+                    'finish_reason': 'stop'
+                }],
+                'usage': self._usage(request, content)
+            })
+
+    def _content_for(self, request):
+        if (request.get('response_format') or {}).get('type') != 'json_object':
+            return STUB_ANSWER
+        system_prompt = request['messages'][0]['content']
+        result = {'intent': 'general_info', 'confidence': 0.9, 'entities': []}
+        if '"response"' in system_prompt:
+            # Single-call mode asks for the answer alongside the classification
+            result['response'] = STUB_ANSWER
+        return json.dumps(result)
+
+    def _usage(self, request, content):
+        prompt_tokens = sum(len(message['content']) for message in request.get('messages', [])) // 4
+        completion_tokens = len(content) // 4
+        return {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'total_tokens': prompt_tokens + completion_tokens
+        }
+
+    def _send_stream(self, request, content):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        for word in content.split(' '):
+            chunk = {
+                'id': completion_id,
+                'object': 'chat.completion.chunk',
+                'created': int(time.time()),
+                'model': request.get('model', 'stub'),
+                'choices': [{'index': 0, 'delta': {'content': word + ' '}, 'finish_reason': None}]
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+            self.wfile.flush()
+            time.sleep(self.chunk_delay)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+        self.close_connection = True
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--latency', type=float, default=0.5, help='mean response latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.1, help='uniform +/- jitter in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with HTTP 500')
+    parser.add_argument('--chunk-delay', type=float, default=0.02, help='delay between streamed chunks in seconds')
+    args = parser.parse_args()
+
+    StubHandler.latency = args.latency
+    StubHandler.jitter = args.jitter
+    StubHandler.error_rate = args.error_rate
+    StubHandler.chunk_delay = args.chunk_delay
+
+    server = ThreadingHTTPServer((args.host, args.port), StubHandler)
+    print(f"Stub OpenAI server on http://{args.host}:{args.port}/v1 "
+          f"(latency={args.latency}s jitter={args.jitter}s error_rate={args.error_rate})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -1,128 +1,693 @@
 import json
+import logging
 import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from openai import OpenAI
-from knowledge_base import InternshipKnowledgeBase
+from knowledge_base import InternshipKnowledgeBase, QUICK_TOPICS
+from conversation_context import ConversationContext
+from session_store import SessionStore, DiskSessionStore
+from intent_router import IntentRouter, LocalIntentClassifier
+from keyword_matcher import KeywordMatcher
+from singleflight import SingleFlight
+from circuit_breaker import CircuitBreaker
+from rate_limiter import TokenBucket
+from metrics import REGISTRY
+from warmup import AnswerWarmer
+from transcript_log import TranscriptLogger
+from response_cache import ResponseCache, MemoryCacheBackend, DiskCacheBackend, is_follow_up
+
+DEFAULT_SESSION_ID = 'default'
+
+logger = logging.getLogger(__name__)
+
+# Stages overlap: kb_lookup runs inside prompt_build, and everything inside total
+STAGE_SECONDS = REGISTRY.histogram('chatbot_stage_seconds', 'Time spent in each stage of answering a message', ['stage'])
+RESPONSES = REGISTRY.counter('chatbot_responses_total', 'Responses by the branch that produced them', ['source'])
+INTENT_TIERS = REGISTRY.counter('chatbot_intent_tier_total', 'Classified messages by the router tier that decided them', ['tier'])
+UPSTREAM_TOKENS = REGISTRY.counter('chatbot_upstream_tokens_total', 'OpenAI token usage reported by completions', ['type'])
+
+# Keyword mappings used by the fallback classifier when OpenAI is unavailable
+INTENT_KEYWORDS = {
+    'application_process': ['apply', 'application', 'submit', 'resume', 'cv', 'cover letter', 'portfolio'],
+    'requirements': ['requirements', 'qualifications', 'skills', 'eligible', 'gpa', 'prerequisites'],
+    'timeline': ['when', 'deadline', 'timeline', 'duration', 'how long', 'start date', 'end date'],
+    'compensation': ['pay', 'paid', 'salary', 'wage', 'money', 'compensation', 'benefits', 'stipend'],
+    'location': ['where', 'location', 'remote', 'work from home', 'relocate', 'city', 'office'],
+    'selection_process': ['interview', 'selection', 'process', 'chosen', 'assessment', 'test'],
+    'program_details': ['what do', 'responsibilities', 'tasks', 'projects', 'mentor', 'training'],
+    'company_culture': ['culture', 'environment', 'dress code', 'workplace', 'team'],
+    'preparation': ['prepare', 'ready', 'tips', 'advice', 'how to'],
+    'greeting': ['hello', 'hi', 'hey', 'good morning', 'good afternoon'],
+    'goodbye': ['bye', 'goodbye', 'thank you', 'thanks', 'see you']
+}
+
+# Intent catalogue shared by the classification prompts
+INTENT_DESCRIPTIONS = """
+- application_process: Questions about how to apply for internships
+- requirements: Questions about eligibility, skills, or qualifications needed
+- timeline: Questions about application deadlines, program duration, start dates
+- compensation: Questions about salary, stipends, benefits
+- location: Questions about where internships are located, remote work
+- selection_process: Questions about interviews, assessments, selection criteria
+- program_details: Questions about what interns will do, projects, mentorship
+- company_culture: Questions about work environment, dress code, office culture
+- preparation: Questions about how to prepare for internships or interviews
+- general_info: General questions about internships
+- greeting: Greetings and conversation starters
+- goodbye: Farewell messages
+- other: Anything not related to internships
+"""
 
 class InternshipChatbot:
-    def __init__(self):
+    def __init__(self, single_call=None, warmup_questions=None):
         # the newest OpenAI model is "gpt-5" which was released August 7, 2025.
         # do not change this unless explicitly requested by the user
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        self.knowledge_base = InternshipKnowledgeBase()
-        self.conversation_context = []
+        # OPENAI_BASE_URL may point at any OpenAI-compatible server (e.g. a local fake for testing)
+        # SDK retries are disabled: the circuit breaker decides when to try OpenAI again
+        self.classify_timeout = float(os.getenv("CHATBOT_CLASSIFY_TIMEOUT", "4"))
+        self.generate_timeout = float(os.getenv("CHATBOT_GENERATE_TIMEOUT", "15"))
+        self.max_retries = int(os.getenv("CHATBOT_OPENAI_MAX_RETRIES", "0"))
+        self.client = OpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            base_url=os.getenv("OPENAI_BASE_URL"),
+            timeout=self.generate_timeout,
+            max_retries=self.max_retries
+        )
+        self.breaker = CircuitBreaker(
+            failure_threshold=int(os.getenv("CHATBOT_BREAKER_FAILURES", "5")),
+            recovery_timeout=float(os.getenv("CHATBOT_BREAKER_RECOVERY", "30"))
+        )
+        # Shared budget for upstream calls; 0 disables limiting
+        upstream_rate = float(os.getenv("CHATBOT_UPSTREAM_RATE", "0"))
+        self.upstream_limiter = TokenBucket(upstream_rate, float(os.getenv("CHATBOT_UPSTREAM_BURST", str(max(1.0, upstream_rate)))))
+        self.batch_workers = int(os.getenv("CHATBOT_BATCH_WORKERS", "8"))
+        # FAQ content lives in a data file; edits are picked up without a restart
+        self.knowledge_base = InternshipKnowledgeBase(
+            path=os.getenv("CHATBOT_KB_PATH"),
+            snapshot_path=os.getenv("CHATBOT_KB_SNAPSHOT"),
+            reload_interval=float(os.getenv("CHATBOT_KB_RELOAD_INTERVAL", "2"))
+        )
+        # CHATBOT_SHARED_STATE_PATH keeps sessions (and by default the answer cache) in one
+        # SQLite file shared by every worker process on the host
+        shared_state_path = os.getenv("CHATBOT_SHARED_STATE_PATH")
+        session_options = dict(
+            max_sessions=int(os.getenv("CHATBOT_MAX_SESSIONS", "10000")),
+            idle_ttl=float(os.getenv("CHATBOT_SESSION_TTL", "1800")),
+            token_budget=int(os.getenv("CHATBOT_CONTEXT_TOKENS", "600")),
+            summary_budget=int(os.getenv("CHATBOT_SUMMARY_TOKENS", "150"))
+        )
+        if shared_state_path:
+            self.sessions = DiskSessionStore(shared_state_path, **session_options)
+        else:
+            self.sessions = SessionStore(**session_options)
+        self.keyword_matcher = KeywordMatcher(INTENT_KEYWORDS)
+        self.intent_router = IntentRouter(
+            LocalIntentClassifier().fit(self.knowledge_base.training_examples()),
+            self._classify_intent_remote,
+            self._classify_intent_fallback,
+            threshold=float(os.getenv("CHATBOT_INTENT_LOCAL_THRESHOLD", "0.85"))
+        )
+        # Single-call mode classifies and answers in one completion instead of two
+        if single_call is None:
+            single_call = os.getenv("CHATBOT_SINGLE_CALL", "").lower() in ("1", "true", "yes")
+        self.single_call = single_call
+        
+        # Answer cache; CHATBOT_CACHE_PATH switches to an on-disk store that survives restarts
+        cache_path = os.getenv("CHATBOT_CACHE_PATH") or shared_state_path
+        max_entries = int(os.getenv("CHATBOT_CACHE_MAX_ENTRIES", "1000"))
+        max_bytes = int(os.getenv("CHATBOT_CACHE_MAX_BYTES", str(4 * 1024 * 1024)))
+        if cache_path:
+            backend = DiskCacheBackend(cache_path, max_entries=max_entries, max_bytes=max_bytes)
+        else:
+            backend = MemoryCacheBackend(max_entries=max_entries, max_bytes=max_bytes)
+        self.cache = ResponseCache(backend, ttl=float(os.getenv("CHATBOT_CACHE_TTL", "3600")))
+        # Session and cache calls block on SQLite when either lives on disk
+        self.state_on_disk = bool(shared_state_path or cache_path)
+        self.inflight = SingleFlight()
+        
+        # Transcripts are written off the request path; unset CHATBOT_TRANSCRIPT_PATH disables them
+        transcript_path = os.getenv("CHATBOT_TRANSCRIPT_PATH")
+        self.transcripts = None
+        if transcript_path:
+            self.transcripts = TranscriptLogger(
+                transcript_path,
+                max_queue=int(os.getenv("CHATBOT_TRANSCRIPT_QUEUE", "10000")),
+                max_bytes=int(os.getenv("CHATBOT_TRANSCRIPT_MAX_BYTES", str(64 * 1024 * 1024)))
+            ).start()
+            REGISTRY.callback('chatbot_transcript_written_total', 'Transcript records written', 'counter',
+                              lambda: self.transcripts.written)
+            REGISTRY.callback('chatbot_transcript_dropped_total', 'Transcript records dropped under backpressure or write errors',
+                              'counter', lambda: self.transcripts.dropped)
+        
+        self.knowledge_base.on_reload(self._on_knowledge_base_reload)
+        
+        REGISTRY.callback('chatbot_cache_hits_total', 'Response cache hits', 'counter', lambda: self.cache.hits)
+        REGISTRY.callback('chatbot_cache_misses_total', 'Response cache misses', 'counter', lambda: self.cache.misses)
+        REGISTRY.callback('chatbot_sessions', 'Active conversation sessions', 'gauge', lambda: len(self.sessions))
+        REGISTRY.callback('chatbot_circuit_open', '1 while the OpenAI circuit breaker is open', 'gauge',
+                          lambda: 1 if self.breaker.state == 'open' else 0)
         
-    def get_response(self, user_message):
+        # Answers for canonical questions (sidebar and FAQ by default) are precomputed in the background
+        questions_path = os.getenv("CHATBOT_WARMUP_QUESTIONS")
+        if warmup_questions is None and questions_path:
+            with open(questions_path, encoding='utf-8') as f:
+                warmup_questions = [line.strip() for line in f if line.strip()]
+        self.warmup_questions = warmup_questions
+        self.warmer = AnswerWarmer(
+            self._resolve_canonical,
+            self._canonical_questions,
+            refresh_interval=float(os.getenv("CHATBOT_WARMUP_REFRESH", "3600")),
+            version=lambda: self.knowledge_base.version
+        )
+        REGISTRY.callback('chatbot_warmed_answers', 'Canonical questions with a precomputed answer', 'gauge',
+                          lambda: len(self.warmer))
+        if os.getenv("CHATBOT_WARMUP", "1").lower() not in ("0", "false", "no"):
+            self.warmer.start()
+        
+    def get_response(self, user_message, session_id=DEFAULT_SESSION_ID):
         """
         Process user message and return appropriate response
         """
+        turn_started = time.perf_counter()
+        with STAGE_SECONDS.time(stage='total'):
+            try:
+                conversation_context, cacheable, intent_result, response = self._begin_turn(session_id, user_message)
+                
+                # Get intent and generate response
+                mode = 'two_call'
+                if intent_result is None:
+                    if self.single_call:
+                        intent_result, response, mode = self._classify_and_answer(user_message, conversation_context)
+                    else:
+                        intent_result = self._classify_intent(user_message)
+                logger.debug("Intent result: %s", intent_result)
+                
+                branch, response = self._select_answer(user_message, intent_result, cacheable, response)
+                if response is None:
+                    response = self._generate_response(branch, user_message, intent_result, conversation_context)
+                
+                self._finish_turn(session_id, user_message, intent_result, branch, cacheable, response, turn_started, mode)
+                return response
+                
+            except Exception:
+                logger.exception("Failed to answer message")
+                return self._error_response()
+    
+    def stream_response(self, user_message, session_id=DEFAULT_SESSION_ID):
+        """
+        Process user message and yield (event, data) pairs as the response is produced.
+        
+        Emits one 'intent' event as soon as the message is classified, 'token'
+        events carrying response text as it arrives, and a final 'done' event
+        with the complete response.
+        """
+        turn_started = time.perf_counter()
         try:
-            # Add user message to context
-            self.conversation_context.append({"role": "user", "content": user_message})
+            conversation_context, cacheable, intent_result, response = self._begin_turn(session_id, user_message)
+            if intent_result is None:
+                intent_result = self._classify_intent(user_message)
+            yield 'intent', self._intent_event(intent_result)
             
-            # Keep only last 10 messages for context
-            if len(self.conversation_context) > 10:
-                self.conversation_context = self.conversation_context[-10:]
+            streamed = False
+            branch, response = self._select_answer(user_message, intent_result, cacheable, response)
+            if response is None and branch == 'contextual':
+                chunks = []
+                try:
+                    for text in self._stream_contextual(user_message, intent_result, conversation_context):
+                        chunks.append(text)
+                        yield 'token', {'text': text}
+                except Exception as e:
+                    logger.warning("Response streaming error: %s", e)
+                    if chunks:
+                        # The stream broke part way through; don't cache the partial answer
+                        self.breaker.record_failure()
+                        cacheable = False
+                streamed = bool(chunks)
+                response = self._streamed_response(user_message, intent_result, chunks)
+            elif response is None:
+                response = self._generate_response(branch, user_message, intent_result, conversation_context)
             
-            # Get intent and generate response
-            intent_result = self._classify_intent(user_message)
-            print(f"Intent result: {intent_result}")
+            if not streamed:
+                yield 'token', {'text': response['response']}
             
-            if intent_result.get('confidence', 0) > 0.7:
-                # High confidence AI classification - use contextual response
-                response = self._generate_contextual_response(user_message, intent_result)
-            elif intent_result.get('confidence', 0) > 0 and intent_result.get('intent') != 'other':
-                # Keyword-based classification detected an intent - use knowledge base
-                response = self._generate_knowledge_base_response(intent_result.get('intent'), user_message)
-            else:
-                # No clear intent detected - use fallback
-                response = self._generate_fallback_response(user_message)
+            self._finish_turn(session_id, user_message, intent_result, branch, cacheable, response, turn_started)
+            yield 'done', response
             
-            # Add bot response to context
-            self.conversation_context.append({"role": "assistant", "content": response['response']})
-            
-            return response
-            
-        except Exception as e:
-            return {
-                'response': 'I apologize, but I encountered a technical issue. Please try rephrasing your question or contact support.',
-                'intent': 'error',
-                'confidence': 0.0
-            }
+        except Exception:
+            logger.exception("Failed to stream answer")
+            yield 'error', self._error_response()
+    
+    def _stream_contextual(self, message, intent_result, conversation_context):
+        """
+        Yield the text of a contextual answer as OpenAI streams it
+        """
+        messages = self._build_contextual_messages(message, intent_result, conversation_context)
+        started = time.perf_counter()
+        remaining = self._acquire_upstream(self.generate_timeout)
+        stream = self.breaker.call(lambda: self.client.chat.completions.create(
+            model="gpt-4o",
+            messages=messages,
+            stream=True,
+            stream_options={"include_usage": True},
+            timeout=remaining
+        ))
+        first = True
+        for chunk in stream:
+            text = self._chunk_text(chunk)
+            if text:
+                if first:
+                    STAGE_SECONDS.observe(time.perf_counter() - started, stage='first_token')
+                    first = False
+                yield text
+    
+    def batch_responses(self, messages, max_workers=None):
+        """
+        Answer many independent messages concurrently, yielding results as each completes.
+        
+        Messages run on a bounded thread pool, each in its own throwaway session,
+        and their upstream calls share the rate limiter with live traffic. Each
+        result carries the message's index, the response, its latency and an
+        'ok' flag that is False when the message could not be answered.
+        """
+        executor = ThreadPoolExecutor(max_workers=max_workers or self.batch_workers, thread_name_prefix='chat-batch')
+        try:
+            futures = [executor.submit(self._batch_item, index, message) for index, message in enumerate(messages)]
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # Drop queued work if the consumer stops early (e.g. the client disconnected)
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _batch_item(self, index, message):
+        started = time.perf_counter()
+        message = str(message).strip()
+        if not message:
+            return self._batch_result(index, message, None, started)
+        session_id = f"batch-{uuid.uuid4().hex}"
+        try:
+            response = self.get_response(message, session_id)
+        finally:
+            self.sessions.reset(session_id)
+        return self._batch_result(index, message, response, started)
+    
+    def _batch_result(self, index, message, response, started):
+        result = {
+            'index': index,
+            'message': message,
+            'ok': response is not None and response.get('source') != 'error',
+            'latency_ms': round((time.perf_counter() - started) * 1000, 1)
+        }
+        if response is None:
+            result['error'] = 'Empty message'
+        else:
+            result['response'] = response
+        return result
+    
+    def _create_completion(self, timeout, **params):
+        """
+        Create a chat completion within a deadline.
+        
+        Concurrent identical requests share one upstream call, and the call
+        fails fast with CircuitOpenError while OpenAI is known to be down.
+        """
+        key = json.dumps(params, sort_keys=True)
+        return self.inflight.do(
+            key,
+            lambda: self._call_upstream_limited(timeout, params),
+            timeout=timeout
+        )
+    
+    def _call_upstream_limited(self, timeout, params):
+        # Waiting for rate limit capacity is not an upstream failure, so it happens outside the breaker
+        remaining = self._acquire_upstream(timeout)
+        return self.breaker.call(lambda: self._call_upstream(remaining, params))
+    
+    def _acquire_upstream(self, timeout):
+        """
+        Wait for rate limit capacity and return how much of the deadline is left for the call
+        """
+        started = time.perf_counter()
+        self.upstream_limiter.acquire(timeout=timeout)
+        return max(0.0, timeout - (time.perf_counter() - started))
+    
+    def _call_upstream(self, timeout, params):
+        with STAGE_SECONDS.time(stage='upstream'):
+            response = self.client.chat.completions.create(timeout=timeout, **params)
+        self._record_usage(getattr(response, 'usage', None))
+        return response
+    
+    def _record_usage(self, usage):
+        """
+        Count the tokens reported by a completion or final stream chunk
+        """
+        if usage is None:
+            return
+        UPSTREAM_TOKENS.inc(usage.prompt_tokens or 0, type='prompt')
+        UPSTREAM_TOKENS.inc(usage.completion_tokens or 0, type='completion')
+    
+    def _error_response(self):
+        RESPONSES.inc(source='error')
+        return {
+            'response': 'I apologize, but I encountered a technical issue. Please try rephrasing your question or contact support.',
+            'intent': 'error',
+            'confidence': 0.0,
+            'source': 'error'
+        }
+    
+    def _begin_turn(self, session_id, user_message):
+        """
+        Record the user message and look up a warmed answer.
+        
+        Returns (conversation_context, cacheable, intent_result, response); the
+        last two are None unless the message is a warmed canonical question.
+        """
+        # Add user message to context (older turns are folded into a rolling summary)
+        self.sessions.append(session_id, "user", user_message)
+        conversation_context = self.sessions.get_context(session_id)
+        
+        # Follow-ups depend on earlier turns, so they never use the cache
+        cacheable = not is_follow_up(user_message, conversation_context)
+        
+        # Canonical questions are answered from the warm-up set without classifying
+        intent_result, response = self._get_warmed_response(user_message) if cacheable else (None, None)
+        return conversation_context, cacheable, intent_result, response
+    
+    def _select_answer(self, message, intent_result, cacheable, response):
+        """
+        Pick the branch for a classified message and reuse a cached answer when there is one
+        """
+        branch = self._select_branch(intent_result)
+        if response is None and cacheable:
+            response = self._get_cached_response(message, intent_result)
+        return branch, response
+    
+    def _intent_event(self, intent_result):
+        return {
+            'intent': intent_result.get('intent', 'general_info'),
+            'confidence': intent_result.get('confidence', 0),
+            'tier': intent_result.get('tier')
+        }
+    
+    def _chunk_text(self, chunk):
+        """
+        Record usage from a streamed chunk and return its text, if any
+        """
+        self._record_usage(getattr(chunk, 'usage', None))
+        if not chunk.choices:
+            return None
+        return chunk.choices[0].delta.content
+    
+    def _streamed_response(self, message, intent_result, chunks):
+        """
+        Build the response for a streamed contextual answer
+        """
+        intent = intent_result.get('intent', 'general_info')
+        if not chunks:
+            # Nothing was streamed - answer from the knowledge base instead
+            return self._generate_knowledge_base_response(intent, message)
+        return self._contextual_response(intent_result, ''.join(chunks))
+    
+    def _finish_turn(self, session_id, user_message, intent_result, branch, cacheable, response, started, mode='two_call'):
+        """
+        Cache the answer if allowed, annotate it, record it in the session and queue it for the transcript log.
+        
+        ``mode`` is the path that produced the answer: 'single_call' when one
+        combined completion classified the message, otherwise 'two_call'.
+        Answers served from the cache or warm-up set are reported as 'cache'.
+        """
+        if cacheable:
+            self._cache_response(user_message, intent_result, branch, response)
+        
+        response['tier'] = intent_result.get('tier')
+        response['mode'] = 'cache' if response.get('cached') else mode
+        RESPONSES.inc(source=response.get('source', 'unknown'))
+        INTENT_TIERS.inc(tier=response['tier'] or 'unknown')
+        
+        # Add bot response to context
+        self.sessions.append(session_id, "assistant", response['response'])
+        
+        if self.transcripts is not None:
+            self.transcripts.log({
+                'timestamp': time.time(),
+                'session_id': session_id,
+                'message': user_message,
+                'response': response['response'],
+                'intent': response.get('intent'),
+                'confidence': response.get('confidence'),
+                'branch': branch,
+                'source': response.get('source'),
+                'tier': response['tier'],
+                'cached': bool(response.get('cached')),
+                'latency_ms': round((time.perf_counter() - started) * 1000, 1)
+            })
+    
+    def _get_cached_response(self, message, intent_result):
+        """
+        Return a cached answer for a message, or None on a miss
+        """
+        cached = self.cache.get(message, intent_result.get('intent'))
+        if cached is None:
+            return None
+        cached['cached'] = True
+        return cached
+    
+    def _get_warmed_response(self, message):
+        """
+        Return the precomputed (intent_result, response) for a canonical question, or (None, None)
+        """
+        warmed = self.warmer.get(message)
+        if warmed is None:
+            return None, None
+        intent_result, response = warmed
+        response['cached'] = True
+        return intent_result, response
+    
+    def _canonical_questions(self):
+        """
+        Questions to precompute answers for: the configured list, or the sidebar and FAQ questions
+        """
+        if self.warmup_questions is not None:
+            return list(self.warmup_questions)
+        questions = [topic['question'] for topic in QUICK_TOPICS]
+        for data in self.knowledge_base.faq_data.values():
+            questions.extend(data['questions'])
+        return questions
+    
+    def _resolve_canonical(self, question):
+        """
+        Answer a canonical question outside any session, for the warm-up set
+        """
+        conversation_context = ConversationContext(self.sessions.token_budget, self.sessions.summary_budget)
+        conversation_context.append("user", question)
+        
+        response = None
+        mode = 'two_call'
+        if self.single_call:
+            intent_result, response, mode = self._classify_and_answer(question, conversation_context)
+        else:
+            intent_result = self._classify_intent(question)
+        branch = self._select_branch(intent_result)
+        if branch == 'fallback':
+            return None
+        if response is None:
+            response = self._generate_response(branch, question, intent_result, conversation_context)
+        
+        # Don't pin a degraded answer (e.g. knowledge base text while OpenAI is down)
+        if response.get('source') != branch:
+            return None
+        response['tier'] = intent_result.get('tier')
+        response['mode'] = mode
+        return intent_result, response
+    
+    def _cache_response(self, message, intent_result, branch, response):
+        """
+        Store a freshly generated answer if it came from the intended branch
+        """
+        # Skip cache hits, random fallbacks and degraded answers (e.g. knowledge
+        # base text served because OpenAI failed on a contextual branch)
+        if response.get('cached') or branch == 'fallback' or response.get('source') != branch:
+            return
+        self.cache.set(message, intent_result.get('intent'), response)
+    
+    def _select_branch(self, intent_result):
+        """
+        Decide which response strategy handles a classified message
+        """
+        if intent_result.get('confidence', 0) > 0.7:
+            # High confidence classification - use contextual response
+            return 'contextual'
+        if intent_result.get('confidence', 0) > 0 and intent_result.get('intent') != 'other':
+            # Keyword-based classification detected an intent - use knowledge base
+            return 'knowledge_base'
+        # No clear intent detected - use fallback
+        return 'fallback'
+    
+    def _generate_response(self, branch, message, intent_result, conversation_context):
+        """
+        Generate a fresh answer on the selected branch
+        """
+        if branch == 'contextual':
+            return self._generate_contextual_response(message, intent_result, conversation_context)
+        if branch == 'knowledge_base':
+            return self._generate_knowledge_base_response(intent_result.get('intent'), message)
+        return self._generate_fallback_response(message)
     
     def _classify_intent(self, message):
         """
-        Classify user intent using OpenAI or fallback to keyword matching
+        Classify user intent locally, escalating to OpenAI and then keyword matching
+        """
+        with STAGE_SECONDS.time(stage='classification'):
+            return self.intent_router.classify(message)
+    
+    def _build_classification_messages(self, message):
+        """
+        Build the chat messages for remote intent classification
+        """
+        system_prompt = f"""
+        You are an intent classifier for an internship FAQ chatbot. 
+        Classify the user's message into one of these intents and provide a confidence score:
+        
+        Available intents:
+        {INTENT_DESCRIPTIONS}
+        
+        Respond with JSON in this format:
+        {{"intent": "intent_name", "confidence": 0.95, "entities": ["relevant", "keywords"]}}
+        """
+        
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": message}
+        ]
+    
+    def _classify_intent_remote(self, message):
+        """
+        Classify user intent using OpenAI, returning None when it is unavailable
         """
         try:
-            system_prompt = f"""
-            You are an intent classifier for an internship FAQ chatbot. 
-            Classify the user's message into one of these intents and provide a confidence score:
-            
-            Available intents:
-            - application_process: Questions about how to apply for internships
-            - requirements: Questions about eligibility, skills, or qualifications needed
-            - timeline: Questions about application deadlines, program duration, start dates
-            - compensation: Questions about salary, stipends, benefits
-            - location: Questions about where internships are located, remote work
-            - selection_process: Questions about interviews, assessments, selection criteria
-            - program_details: Questions about what interns will do, projects, mentorship
-            - company_culture: Questions about work environment, dress code, office culture
-            - preparation: Questions about how to prepare for internships or interviews
-            - general_info: General questions about internships
-            - greeting: Greetings and conversation starters
-            - goodbye: Farewell messages
-            - other: Anything not related to internships
-            
-            Respond with JSON in this format:
-            {{"intent": "intent_name", "confidence": 0.95, "entities": ["relevant", "keywords"]}}
-            """
-            
-            response = self.client.chat.completions.create(
+            response = self._create_completion(
+                timeout=self.classify_timeout,
                 model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": message}
-                ],
+                messages=self._build_classification_messages(message),
                 response_format={"type": "json_object"}
             )
             
             content = response.choices[0].message.content
             if not content:
-                return self._classify_intent_fallback(message)
+                return None
             return json.loads(content)
             
         except Exception as e:
-            print(f"Intent classification error: {e}")
-            # Use keyword-based fallback when OpenAI is unavailable
-            return self._classify_intent_fallback(message)
+            logger.warning("Intent classification error: %s", e)
+            # The router falls back to keyword matching when OpenAI is unavailable
+            return None
+    
+    def _classify_and_answer(self, message, conversation_context):
+        """
+        Classify and answer in a single OpenAI round trip.
+        
+        Returns (intent_result, response, mode). response is None when the
+        normal branches should produce the answer instead: after a confident
+        local classification, a low-confidence result, or when OpenAI is
+        unavailable. mode is 'single_call' only when the combined completion
+        actually classified the message.
+        """
+        local_result = self.intent_router.classify_local(message)
+        if local_result is not None:
+            return local_result, None, 'two_call'
+        
+        try:
+            response = self._create_completion(
+                timeout=self.generate_timeout,
+                model="gpt-4o",
+                messages=self._build_single_call_messages(message, conversation_context),
+                response_format={"type": "json_object"}
+            )
+            return self._parse_single_call(message, response.choices[0].message.content)
+            
+        except Exception as e:
+            logger.warning("Single-call response error: %s", e)
+            return self.intent_router.classify_fallback(message), None, 'two_call'
+    
+    def _build_single_call_messages(self, message, conversation_context):
+        """
+        Build the chat messages for a combined classify-and-answer completion
+        """
+        started = time.perf_counter()
+        
+        # Shortlist likely intents locally so the prompt only carries their FAQ context
+        with STAGE_SECONDS.time(stage='kb_lookup'):
+            shortlist = self.intent_router.local_classifier.top_intents(message, k=3)
+            for result in self.knowledge_base.search_faqs(message, top_k=3):
+                if result['intent'] not in shortlist:
+                    shortlist.append(result['intent'])
+            if not shortlist:
+                shortlist = list(self.knowledge_base.faq_data)
+            faq_context = "\n\n".join(f"[{intent}]\n{self.knowledge_base.get_faq_by_intent(intent)}" for intent in shortlist)
+        
+        context = conversation_context.render()
+        
+        system_prompt = f"""
+        You are a helpful internship advisor chatbot. Classify the user's message and answer it in one step.
+        
+        Available intents:
+        {INTENT_DESCRIPTIONS}
+        
+        Current conversation context:
+        {context}
+        
+        Relevant FAQ information:
+        {faq_context}
+        
+        Guidelines for the answer:
+        1. Be friendly, professional, and helpful
+        2. Provide specific, actionable advice when possible
+        3. If you don't know something, be honest and suggest alternatives
+        4. Keep responses concise but informative (2-3 sentences typically)
+        5. Use the FAQ information as a reference but don't just copy it verbatim
+        6. Maintain conversation flow and refer to previous context when relevant
+        
+        Respond with JSON in this format:
+        {{"intent": "intent_name", "confidence": 0.95, "entities": ["relevant", "keywords"], "response": "your answer"}}
+        """
+        
+        STAGE_SECONDS.observe(time.perf_counter() - started, stage='prompt_build')
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": message}
+        ]
+    
+    def _parse_single_call(self, message, content):
+        """
+        Split a combined completion into (intent_result, response, mode)
+        """
+        result = json.loads(content or "{}")
+        answer = result.pop('response', None)
+        if 'intent' not in result:
+            return self.intent_router.classify_fallback(message), None, 'two_call'
+        result['tier'] = 'remote'
+        
+        if not answer or self._select_branch(result) != 'contextual':
+            return result, None, 'single_call'
+        return result, {
+            'response': answer,
+            'intent': result['intent'],
+            'confidence': result.get('confidence', 0),
+            'source': 'contextual'
+        }, 'single_call'
     
     def _classify_intent_fallback(self, message):
         """
         Keyword-based intent classification when OpenAI is unavailable
         """
-        message_lower = message.lower()
-        
-        # Define keyword mappings for each intent
-        intent_keywords = {
-            'application_process': ['apply', 'application', 'submit', 'resume', 'cv', 'cover letter', 'portfolio'],
-            'requirements': ['requirements', 'qualifications', 'skills', 'eligible', 'gpa', 'prerequisites'],
-            'timeline': ['when', 'deadline', 'timeline', 'duration', 'how long', 'start date', 'end date'],
-            'compensation': ['pay', 'paid', 'salary', 'wage', 'money', 'compensation', 'benefits', 'stipend'],
-            'location': ['where', 'location', 'remote', 'work from home', 'relocate', 'city', 'office'],
-            'selection_process': ['interview', 'selection', 'process', 'chosen', 'assessment', 'test'],
-            'program_details': ['what do', 'responsibilities', 'tasks', 'projects', 'mentor', 'training'],
-            'company_culture': ['culture', 'environment', 'dress code', 'workplace', 'team'],
-            'preparation': ['prepare', 'ready', 'tips', 'advice', 'how to'],
-            'greeting': ['hello', 'hi', 'hey', 'good morning', 'good afternoon'],
-            'goodbye': ['bye', 'goodbye', 'thank you', 'thanks', 'see you']
-        }
+        scores, terms = self.keyword_matcher.match(message)
         
-        # Calculate scores for each intent
+        # Pick the best scoring intent (first one wins ties)
         best_intent = 'general_info'
         best_score = 0
         
-        for intent, keywords in intent_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in message_lower)
+        for intent, score in scores.items():
             if score > best_score:
                 best_score = score
                 best_intent = intent
@@ -133,19 +698,21 @@ class InternshipChatbot:
         return {
             'intent': best_intent,
             'confidence': confidence,
-            'entities': []
+            'entities': terms
         }
     
-    def _generate_contextual_response(self, message, intent_result):
+    def _build_contextual_messages(self, message, intent_result, conversation_context):
         """
-        Generate response based on classified intent and knowledge base
+        Build the chat messages for a contextual response
         """
+        started = time.perf_counter()
         intent = intent_result.get('intent', 'general_info')
         
         # Get relevant FAQ from knowledge base
-        relevant_faq = self.knowledge_base.get_faq_by_intent(intent)
+        with STAGE_SECONDS.time(stage='kb_lookup'):
+            relevant_faq = self.knowledge_base.get_faq_by_intent(intent)
         
-        context = "\n".join([f"{msg['role']}: {msg['content']}" for msg in self.conversation_context[-4:]])
+        context = conversation_context.render()
         
         system_prompt = f"""
         You are a helpful internship advisor chatbot. Your goal is to provide accurate, helpful information about internships.
@@ -170,26 +737,40 @@ class InternshipChatbot:
         Respond naturally to the user's question about internships.
         """
         
+        STAGE_SECONDS.observe(time.perf_counter() - started, stage='prompt_build')
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": message}
+        ]
+    
+    def _generate_contextual_response(self, message, intent_result, conversation_context):
+        """
+        Generate response based on classified intent and knowledge base
+        """
+        intent = intent_result.get('intent', 'general_info')
+        
         try:
-            response = self.client.chat.completions.create(
+            response = self._create_completion(
+                timeout=self.generate_timeout,
                 model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": message}
-                ]
+                messages=self._build_contextual_messages(message, intent_result, conversation_context)
             )
             
-            return {
-                'response': response.choices[0].message.content,
-                'intent': intent,
-                'confidence': intent_result.get('confidence', 0)
-            }
+            return self._contextual_response(intent_result, response.choices[0].message.content)
             
         except Exception as e:
-            print(f"Response generation error: {e}")
+            logger.warning("Response generation error: %s", e)
             # Use knowledge base directly when OpenAI is unavailable
             return self._generate_knowledge_base_response(intent, message)
     
+    def _contextual_response(self, intent_result, text):
+        return {
+            'response': text,
+            'intent': intent_result.get('intent', 'general_info'),
+            'confidence': intent_result.get('confidence', 0),
+            'source': 'contextual'
+        }
+    
     def _generate_fallback_response(self, message):
         """
         Generate fallback response for low confidence or error cases
@@ -205,7 +786,8 @@ class InternshipChatbot:
         return {
             'response': random.choice(fallback_responses),
             'intent': 'fallback',
-            'confidence': 0.0
+            'confidence': 0.0,
+            'source': 'fallback'
         }
     
     def _generate_knowledge_base_response(self, intent, message):
@@ -213,32 +795,44 @@ class InternshipChatbot:
         Generate response directly from knowledge base when OpenAI is unavailable
         """
         if intent in self.knowledge_base.faq_data:
-            faq = self.knowledge_base.faq_data[intent]
-            
             # For specific intents, provide the most relevant answer
             if intent == 'greeting':
                 response = "Hello! I'm here to help you with internship-related questions. Feel free to ask about application processes, requirements, timelines, compensation, and more!"
             elif intent == 'goodbye':
                 response = "Thank you for using the internship FAQ assistant! Best of luck with your internship search and applications!"
             else:
-                # Use the first answer from the knowledge base
-                response = faq['answers'][0]
+                # Use the answer that best matches the user's message
+                with STAGE_SECONDS.time(stage='kb_lookup'):
+                    response = self.knowledge_base.best_answer(intent, message)
             
             return {
                 'response': response,
                 'intent': intent,
-                'confidence': 0.8
+                'confidence': 0.8,
+                'source': 'knowledge_base'
             }
         else:
             # Return general internship information
             return {
                 'response': "I can help you with various internship topics including: application processes, eligibility requirements, timelines, compensation, interview processes, and program details. What specific aspect would you like to know about?",
                 'intent': 'general_info',
-                'confidence': 0.6
+                'confidence': 0.6,
+                'source': 'knowledge_base'
             }
     
-    def reset_context(self):
+    def _on_knowledge_base_reload(self, compiled):
+        """
+        Retrain the local classifier on the new FAQ and drop answers built from the old one.
+        
+        Warmed answers are tagged with the knowledge base version, so they stop being served
+        as soon as the version changes; the refresh rebuilds them.
+        """
+        self.intent_router.local_classifier = LocalIntentClassifier().fit(compiled.training_examples)
+        self.cache.clear()
+        self.warmer.refresh()
+    
+    def reset_context(self, session_id=DEFAULT_SESSION_ID):
         """
-        Reset conversation context
+        Reset conversation context for a session
         """
-        self.conversation_context = []
+        self.sessions.reset(session_id)
@@ -0,0 +1,127 @@
+import threading
+import time
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling a dependency while the circuit is open
+    """
+
+
+class CircuitBreaker:
+    """
+    Shared circuit breaker for calls to an unreliable dependency.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail immediately with CircuitOpenError. Once ``recovery_timeout``
+    seconds have passed it lets up to ``half_open_max_calls`` probe calls
+    through: a successful probe closes the circuit, a failed one reopens it.
+    A probe that is cancelled frees its slot for the next caller.
+    """
+
+    def __init__(self, failure_threshold=5, recovery_timeout=30.0, half_open_max_calls=1):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.rejected = 0
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def allow_request(self):
+        """
+        Return True if a call may go ahead, reserving a probe slot when half-open
+        """
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probes = 0
+
+    def record_failure(self):
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            self._failures += 1
+            if state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._probes = 0
+
+    def release(self):
+        """
+        Give back a probe slot whose call ended without an outcome (e.g. it was cancelled)
+        """
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def call(self, fn):
+        """
+        Run fn() through the breaker, raising CircuitOpenError if the circuit is open
+        """
+        if not self.allow_request():
+            raise CircuitOpenError("Circuit open; skipping upstream call")
+        try:
+            result = fn()
+        except Exception:
+            self.record_failure()
+            raise
+        except BaseException:
+            # Cancellation says nothing about the dependency, but the probe slot must be freed
+            self.release()
+            raise
+        self.record_success()
+        return result
+
+    async def call_async(self, fn):
+        """
+        Await fn() through the breaker, raising CircuitOpenError if the circuit is open
+        """
+        if not self.allow_request():
+            raise CircuitOpenError("Circuit open; skipping upstream call")
+        try:
+            result = await fn()
+        except Exception:
+            self.record_failure()
+            raise
+        except BaseException:
+            # Cancellation says nothing about the dependency, but the probe slot must be freed
+            self.release()
+            raise
+        self.record_success()
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {
+                'state': self._current_state(time.monotonic()),
+                'consecutive_failures': self._failures,
+                'rejected': self.rejected
+            }
+
+    def _current_state(self, now):
+        if self._state == OPEN and now - self._opened_at >= self.recovery_timeout:
+            self._state = HALF_OPEN
+            self._probes = 0
+        return self._state
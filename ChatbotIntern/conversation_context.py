@@ -0,0 +1,107 @@
+from collections import deque
+
+
+def estimate_tokens(text):
+    """
+    Cheap token estimate: roughly four characters per token for English text
+    """
+    return max(1, (len(text) + 3) // 4)
+
+
+class ConversationContext:
+    """
+    Conversation history that fits a token budget.
+
+    Every message carries a token estimate and the running total is kept up
+    to date. When the history goes over ``token_budget``, the oldest messages
+    are folded into a short rolling summary, one line per message. That
+    summary is itself capped at ``summary_budget`` tokens by dropping its
+    oldest lines. Each append only touches the messages that move, so the
+    summary is never rebuilt from scratch.
+    """
+
+    def __init__(self, token_budget=600, summary_budget=150, summary_words=24):
+        self.token_budget = token_budget
+        self.summary_budget = summary_budget
+        self.summary_words = summary_words
+        self.messages = deque()
+        self.summary_lines = deque()
+        self.history_tokens = 0
+        self.summary_tokens = 0
+        self.turns = 0
+
+    def append(self, role, content):
+        tokens = estimate_tokens(content)
+        self.messages.append({"role": role, "content": content, "tokens": tokens})
+        self.history_tokens += tokens
+        self.turns += 1
+
+        # Always keep the newest message, even if it alone exceeds the budget
+        while self.history_tokens > self.token_budget and len(self.messages) > 1:
+            self._fold(self.messages.popleft())
+
+    def render(self):
+        """
+        Return the summary and recent messages as prompt text
+        """
+        lines = []
+        if self.summary_lines:
+            lines.append("Earlier in the conversation: " + " ".join(line for line, _ in self.summary_lines))
+        lines.extend(f"{message['role']}: {message['content']}" for message in self.messages)
+        return "\n".join(lines)
+
+    @property
+    def token_count(self):
+        return self.history_tokens + self.summary_tokens
+
+    def copy(self):
+        clone = ConversationContext(self.token_budget, self.summary_budget, self.summary_words)
+        clone.messages = deque(self.messages)
+        clone.summary_lines = deque(self.summary_lines)
+        clone.history_tokens = self.history_tokens
+        clone.summary_tokens = self.summary_tokens
+        clone.turns = self.turns
+        return clone
+
+    def to_dict(self):
+        """
+        JSON-serializable state, for stores shared between processes
+        """
+        return {
+            'messages': list(self.messages),
+            'summary_lines': [list(entry) for entry in self.summary_lines],
+            'history_tokens': self.history_tokens,
+            'summary_tokens': self.summary_tokens,
+            'turns': self.turns
+        }
+
+    @classmethod
+    def from_dict(cls, data, token_budget=600, summary_budget=150):
+        context = cls(token_budget, summary_budget)
+        context.messages = deque(data['messages'])
+        context.summary_lines = deque(tuple(entry) for entry in data['summary_lines'])
+        context.history_tokens = data['history_tokens']
+        context.summary_tokens = data['summary_tokens']
+        context.turns = data['turns']
+        return context
+
+    def __len__(self):
+        # Counts every message in the conversation, including summarized ones
+        return self.turns
+
+    def _fold(self, message):
+        self.history_tokens -= message['tokens']
+
+        words = message['content'].split()
+        gist = " ".join(words[:self.summary_words])
+        if len(words) > self.summary_words:
+            gist += "..."
+        speaker = "User asked" if message['role'] == "user" else "Assistant answered"
+        line = f"{speaker}: {gist}"
+        line_tokens = estimate_tokens(line)
+
+        self.summary_lines.append((line, line_tokens))
+        self.summary_tokens += line_tokens
+        while self.summary_tokens > self.summary_budget and len(self.summary_lines) > 1:
+            _, dropped_tokens = self.summary_lines.popleft()
+            self.summary_tokens -= dropped_tokens
@@ -0,0 +1,28 @@
+import os
+import weakref
+
+
+def register_after_fork(obj, in_child=None, in_parent=None):
+    """
+    Call ``in_child(obj)`` in every forked child, and ``in_parent(obj)`` in
+    the parent after each fork, for as long as obj is alive.
+
+    Threads do not survive fork(), so objects that run a background thread
+    use this to restart it in each worker of a pre-forking server such as
+    ``gunicorn --preload``.
+    """
+    ref = weakref.ref(obj)
+
+    def hook(callback):
+        def run():
+            target = ref()
+            if target is not None:
+                callback(target)
+        return run
+
+    hooks = {}
+    if in_child is not None:
+        hooks['after_in_child'] = hook(in_child)
+    if in_parent is not None:
+        hooks['after_in_parent'] = hook(in_parent)
+    os.register_at_fork(**hooks)
@@ -0,0 +1,171 @@
+import math
+import zlib
+
+from tokenizer import normalize_text, tokenize
+
+
+class LocalIntentClassifier:
+    """
+    Multinomial naive Bayes over hashed word unigrams and bigrams.
+
+    Trained once at startup from the knowledge base questions, it classifies a
+    message in microseconds without any network access. Exact matches of
+    training examples (such as the sidebar quick topics) are answered from a
+    lookup table with full confidence.
+    """
+
+    def __init__(self, n_buckets=2 ** 18, alpha=0.1):
+        self.n_buckets = n_buckets
+        self.alpha = alpha
+        self.intents = []
+        self._exact = {}
+        self._log_priors = {}
+        self._log_likelihoods = {}
+        self._log_unseen = {}
+        self._vocabulary = set()
+
+    def _features(self, normalized):
+        tokens = tokenize(normalized)
+        grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        return [zlib.crc32(gram.encode('utf-8')) % self.n_buckets for gram in grams]
+
+    def fit(self, examples):
+        """
+        Train on an iterable of (text, intent) pairs
+        """
+        counts = {}
+        documents = {}
+        self._exact = {}
+        for text, intent in examples:
+            normalized = normalize_text(text)
+            self._exact[normalized] = intent
+            documents[intent] = documents.get(intent, 0) + 1
+            intent_counts = counts.setdefault(intent, {})
+            for bucket in self._features(normalized):
+                intent_counts[bucket] = intent_counts.get(bucket, 0) + 1
+
+        self.intents = list(documents)
+        self._vocabulary = set()
+        for intent_counts in counts.values():
+            self._vocabulary.update(intent_counts)
+
+        total_documents = sum(documents.values())
+        vocabulary_size = len(self._vocabulary)
+        self._log_priors = {}
+        self._log_likelihoods = {}
+        self._log_unseen = {}
+        for intent in self.intents:
+            intent_counts = counts[intent]
+            denominator = sum(intent_counts.values()) + self.alpha * vocabulary_size
+            self._log_priors[intent] = math.log(documents[intent] / total_documents)
+            self._log_likelihoods[intent] = {
+                bucket: math.log((count + self.alpha) / denominator)
+                for bucket, count in intent_counts.items()
+            }
+            self._log_unseen[intent] = math.log(self.alpha / denominator)
+        return self
+
+    def top_intents(self, text, k=3):
+        """
+        Return up to k intents ordered by descending likelihood for a message
+        """
+        normalized = normalize_text(text)
+        if normalized in self._exact:
+            return [self._exact[normalized]]
+
+        known = [bucket for bucket in self._features(normalized) if bucket in self._vocabulary]
+        if not known:
+            return []
+        scores = self._scores(known)
+        return sorted(scores, key=scores.get, reverse=True)[:k]
+
+    def _scores(self, known):
+        scores = {}
+        for intent in self.intents:
+            likelihoods = self._log_likelihoods[intent]
+            unseen = self._log_unseen[intent]
+            scores[intent] = self._log_priors[intent] + sum(likelihoods.get(bucket, unseen) for bucket in known)
+        return scores
+
+    def predict(self, text):
+        """
+        Return (intent, confidence) for a message, or (None, 0.0) if unknown
+        """
+        normalized = normalize_text(text)
+        if normalized in self._exact:
+            return self._exact[normalized], 1.0
+
+        features = self._features(normalized)
+        known = [bucket for bucket in features if bucket in self._vocabulary]
+        if not known or not self.intents:
+            return None, 0.0
+
+        scores = self._scores(known)
+        best_intent = max(scores, key=scores.get)
+        best_score = scores[best_intent]
+        posterior = 1.0 / sum(math.exp(score - best_score) for score in scores.values())
+
+        # Discount messages that are mostly vocabulary we have never seen
+        coverage = len(known) / len(features)
+        return best_intent, posterior * coverage
+
+
+class IntentRouter:
+    """
+    Tiered intent classification: local model first, remote model only when
+    the local confidence is below ``threshold``, keyword matching last.
+
+    Every result carries a ``tier`` key naming the tier that decided it.
+    """
+
+    def __init__(self, local_classifier, remote_classify, keyword_classify, threshold=0.85):
+        self.local_classifier = local_classifier
+        self.remote_classify = remote_classify
+        self.keyword_classify = keyword_classify
+        self.threshold = threshold
+
+    def classify_local(self, message):
+        """
+        Return the local classification if it is confident enough, else None
+        """
+        intent, confidence = self.local_classifier.predict(message)
+        if intent is not None and confidence >= self.threshold:
+            return {
+                'intent': intent,
+                'confidence': round(confidence, 4),
+                'entities': [],
+                'tier': 'local'
+            }
+        return None
+
+    def classify_fallback(self, message):
+        """
+        Classify with keyword matching only
+        """
+        result = self.keyword_classify(message)
+        result['tier'] = 'keyword'
+        return result
+
+    def classify(self, message):
+        """
+        Classify a message with the cheapest tier that is confident about it
+        """
+        result = self.classify_local(message)
+        if result is not None:
+            return result
+        return self._escalated(message, self.remote_classify(message))
+
+    async def classify_async(self, message, remote_classify):
+        """
+        Same tiers as classify(), awaiting ``remote_classify(message)`` for the remote tier
+        """
+        result = self.classify_local(message)
+        if result is not None:
+            return result
+        return self._escalated(message, await remote_classify(message))
+
+    def _escalated(self, message, remote_result):
+        if remote_result is not None:
+            remote_result['tier'] = 'remote'
+            return remote_result
+        return self.classify_fallback(message)
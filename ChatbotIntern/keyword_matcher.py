@@ -0,0 +1,100 @@
+import re
+
+
+def _build_trie(terms):
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = True
+    return trie
+
+
+def _trie_pattern(node):
+    # Shared prefixes are factored out, so the regex engine never retries a
+    # prefix it has already matched and cost grows with the message length
+    # rather than with the number of keywords
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+    if '' in node:
+        return '(?:' + '|'.join(branches) + ')?'
+    if len(branches) == 1:
+        return branches[0]
+    return '(?:' + '|'.join(branches) + ')'
+
+
+SUFFIXES = ('s', 'es', 'ed', 'ing', 'er', 'ers', 'ly', 'ment', 'ments', 'ship', 'ships')
+VOWELS = 'aeiou'
+
+
+def _word_forms(term):
+    """
+    Spellings of a keyword followed by each suffix, with the usual English
+    adjustments: a silent e is dropped ("prepare" -> "preparing"), a final y
+    after a consonant becomes i ("apply" -> "applied"), and a final consonant
+    after a single vowel may be doubled ("submit" -> "submitting").
+    """
+    forms = []
+    for suffix in SUFFIXES:
+        vowel_suffix = suffix[0] in 'aeiy'
+        if term.endswith('e') and vowel_suffix:
+            forms.append(term[:-1] + suffix)
+        elif term.endswith('y') and term[-2] not in VOWELS and suffix in ('s', 'es', 'ed', 'er', 'ers'):
+            forms.append(term[:-1] + ('ies' if suffix == 's' else 'i' + suffix))
+        else:
+            forms.append(term + suffix)
+            if (vowel_suffix and term[-1] not in VOWELS + 'wxy'
+                    and term[-2] in VOWELS and term[-3] not in VOWELS):
+                forms.append(term + term[-1] + suffix)
+    return forms
+
+
+class KeywordMatcher:
+    """
+    Scores every intent in a single pass over a message.
+
+    All keywords are compiled once into one trie-shaped regex with word
+    boundaries, so "hi" no longer matches inside "this" and "test" no longer
+    matches inside "latest". Keywords of three or more letters also match
+    their common inflected and derived forms ("interviewing", "remotely",
+    "mentorship", "preparing", "applies"); shorter ones must match exactly.
+    """
+
+    def __init__(self, intent_keywords):
+        self.intents = list(intent_keywords)
+        self._term_intents = {}
+        for intent, keywords in intent_keywords.items():
+            for keyword in keywords:
+                self._term_intents.setdefault(keyword.lower(), []).append(intent)
+
+        # Map every accepted surface form back to its keyword
+        self._variants = {}
+        for term in self._term_intents:
+            if len(term) >= 3:
+                for form in _word_forms(term):
+                    self._variants.setdefault(form, term)
+        for term in self._term_intents:
+            self._variants[term] = term
+
+        pattern = _trie_pattern(_build_trie(self._variants))
+        self._regex = re.compile(r'\b(?:' + pattern + r')\b') if pattern else None
+
+    def match(self, message):
+        """
+        Return (scores, terms): matched keyword count per intent and the distinct matched terms
+        """
+        scores = dict.fromkeys(self.intents, 0)
+        terms = []
+        if self._regex is None:
+            return scores, terms
+
+        for match in self._regex.finditer(message.lower()):
+            term = self._variants[match.group(0)]
+            if term in terms:
+                continue
+            terms.append(term)
+            for intent in self._term_intents[term]:
+                scores[intent] += 1
+        return scores, terms
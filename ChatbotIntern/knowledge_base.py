@@ -1,166 +1,312 @@
-class InternshipKnowledgeBase:
-    def __init__(self):
-        self.faq_data = {
-            'application_process': {
-                'questions': [
-                    'How do I apply for internships?',
-                    'What is the application process?',
-                    'Where can I submit my application?'
-                ],
-                'answers': [
-                    'Most internship applications require submitting a resume, cover letter, and sometimes a portfolio or transcripts. Start by researching companies, checking their career pages, and following their specific application instructions.',
-                    'Common steps include: 1) Research opportunities, 2) Prepare application materials, 3) Submit applications online, 4) Complete any required assessments, 5) Participate in interviews if selected.',
-                    'Applications are typically submitted through company career portals, job boards like LinkedIn or Indeed, or university career centers. Some companies also attend career fairs for recruitment.'
-                ]
-            },
-            'requirements': {
-                'questions': [
-                    'What are the requirements for internships?',
-                    'Do I need specific qualifications?',
-                    'What skills do I need?'
-                ],
-                'answers': [
-                    'Requirements vary by field, but generally include being enrolled in a relevant degree program, having a good GPA (usually 3.0+), and demonstrating relevant skills through coursework or projects.',
-                    'Technical internships often require programming skills, familiarity with specific tools, and problem-solving abilities. Soft skills like communication, teamwork, and adaptability are valued across all fields.',
-                    'Most internships are open to students in their sophomore, junior, or senior years. Some programs accept graduate students or recent graduates. Check specific eligibility criteria for each opportunity.'
-                ]
-            },
-            'timeline': {
-                'questions': [
-                    'When should I apply for internships?',
-                    'What are the application deadlines?',
-                    'How long do internships last?'
-                ],
-                'answers': [
-                    'Summer internship applications typically open in early fall and close between January-March. Apply early as many programs have rolling admissions and positions fill quickly.',
-                    'Internships usually last 10-12 weeks for summer programs, though some can be 6-16 weeks. Academic year internships may be part-time for a full semester or longer.',
-                    'Start preparing 6-12 months in advance. Update your resume, build a portfolio, and begin networking. The earlier you start, the more opportunities you\'ll have.'
-                ]
-            },
-            'compensation': {
-                'questions': [
-                    'Are internships paid?',
-                    'How much do interns earn?',
-                    'What benefits do interns receive?'
-                ],
-                'answers': [
-                    'Many internships are paid, especially in tech, finance, and engineering. Rates vary widely from $15-50+ per hour depending on the industry, company size, and location.',
-                    'Some internships offer additional benefits like housing stipends, transportation allowances, meal vouchers, or professional development opportunities.',
-                    'Unpaid internships are less common but still exist, particularly in non-profits, government, and some creative fields. Ensure unpaid internships meet legal requirements and provide valuable learning experiences.'
-                ]
-            },
-            'location': {
-                'questions': [
-                    'Where are internships located?',
-                    'Can I work remotely?',
-                    'Do I need to relocate?'
-                ],
-                'answers': [
-                    'Internships are available in major cities, smaller towns, and increasingly as remote opportunities. Tech companies often offer remote internships, while others may require on-site presence.',
-                    'Many companies provide relocation assistance or housing for interns who need to move. Some offer housing stipends or connect interns with temporary housing options.',
-                    'Remote internships have become more common post-2020. These can be great options for gaining experience without geographical constraints, though networking opportunities may be different.'
-                ]
-            },
-            'selection_process': {
-                'questions': [
-                    'What is the interview process like?',
-                    'How are interns selected?',
-                    'What should I expect in interviews?'
-                ],
-                'answers': [
-                    'The selection process typically includes resume screening, phone/video interviews, and sometimes technical assessments or case studies. Larger companies may have multiple interview rounds.',
-                    'Interviews often focus on technical skills, problem-solving abilities, cultural fit, and motivation. Prepare for behavioral questions using the STAR method (Situation, Task, Action, Result).',
-                    'Technical interviews may include coding challenges, system design questions, or field-specific problems. Practice common interview questions and research the company thoroughly.'
-                ]
-            },
-            'program_details': {
-                'questions': [
-                    'What will I do as an intern?',
-                    'What kind of projects do interns work on?',
-                    'Will I have a mentor?'
-                ],
-                'answers': [
-                    'Interns typically work on real projects that contribute to the company\'s goals. This might include software development, research, marketing campaigns, data analysis, or supporting ongoing initiatives.',
-                    'Most structured internship programs provide mentorship, either through a dedicated mentor or supervisor. Mentors help with professional development, project guidance, and career advice.',
-                    'Good internship programs include orientation, training sessions, networking events, and opportunities to present your work. Some also offer rotations through different departments.'
-                ]
-            },
-            'company_culture': {
-                'questions': [
-                    'What is the work environment like?',
-                    'What should I wear?',
-                    'How do I fit into company culture?'
-                ],
-                'answers': [
-                    'Work environments vary greatly. Tech companies often have casual cultures with flexible hours, while finance or law firms may be more formal. Research the company culture beforehand.',
-                    'Dress codes range from casual to business formal. When in doubt, err on the side of being slightly overdressed, especially for your first day. Ask your recruiter or manager for guidance.',
-                    'Be observant, ask questions, participate in team activities, and be open to learning. Show enthusiasm, take initiative, and build relationships with colleagues and other interns.'
-                ]
-            },
-            'preparation': {
-                'questions': [
-                    'How should I prepare for an internship?',
-                    'What skills should I develop?',
-                    'How can I make a good impression?'
-                ],
-                'answers': [
-                    'Before starting, research the company, industry, and your role. Review relevant technical skills, prepare questions, and set learning goals for your internship experience.',
-                    'Focus on both technical and soft skills. Practice communication, time management, and collaboration. For technical roles, brush up on relevant programming languages, tools, or methodologies.',
-                    'Show up with a positive attitude, be proactive, ask thoughtful questions, and seek feedback regularly. Take notes, meet deadlines, and look for ways to add value beyond your assigned tasks.'
-                ]
-            },
-            'general_info': {
-                'questions': [
-                    'What are the benefits of doing an internship?',
-                    'How do internships help my career?',
-                    'Should I do multiple internships?'
-                ],
-                'answers': [
-                    'Internships provide real-world experience, help you explore career paths, build professional networks, and often lead to full-time job offers. They bridge the gap between academic learning and professional work.',
-                    'Multiple internships can be valuable, especially if they\'re in different areas or companies. This helps you compare industries, build diverse skills, and expand your professional network.',
-                    'Internships also help you develop professional skills, understand workplace dynamics, and make informed career decisions. Many employers prefer candidates with internship experience.'
-                ]
-            },
-            'greeting': {
-                'questions': ['Hello', 'Hi', 'Hey'],
-                'answers': [
-                    'Hello! I\'m here to help you with internship-related questions. Feel free to ask about application processes, requirements, timelines, or any other internship topics!',
-                    'Hi there! I\'m your internship advisor chatbot. I can help you with questions about finding, applying for, and succeeding in internships. What would you like to know?'
-                ]
-            },
-            'goodbye': {
-                'questions': ['Bye', 'Goodbye', 'Thanks'],
-                'answers': [
-                    'Goodbye! Best of luck with your internship search. Feel free to come back anytime you have more questions!',
-                    'Thank you for chatting! I hope I was helpful. Good luck with your internship applications and career journey!'
-                ]
-            }
+import heapq
+import json
+import logging
+import os
+import threading
+
+from fork_safety import register_after_fork
+from search_index import BM25Index
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'faq.json')
+
+# Bump when the compiled layout changes so stale snapshots are ignored
+SNAPSHOT_VERSION = 3
+
+DEFAULT_FAQ_CONTEXT = "I can help with questions about internship applications, requirements, timelines, compensation, and more!"
+
+# Quick topics shown in the sidebar of templates/index.html
+QUICK_TOPICS = [
+    {'label': 'Application Process', 'icon': 'fa-file-alt', 'intent': 'application_process', 'question': 'How do I apply for internships?'},
+    {'label': 'Requirements', 'icon': 'fa-check-circle', 'intent': 'requirements', 'question': 'What are the requirements?'},
+    {'label': 'Timeline', 'icon': 'fa-calendar', 'intent': 'timeline', 'question': 'When should I apply?'},
+    {'label': 'Compensation', 'icon': 'fa-dollar-sign', 'intent': 'compensation', 'question': 'Are internships paid?'},
+    {'label': 'Location', 'icon': 'fa-map-marker-alt', 'intent': 'location', 'question': 'Can I work remotely?'},
+    {'label': 'Selection Process', 'icon': 'fa-users', 'intent': 'selection_process', 'question': 'What is the interview process?'},
+    {'label': 'Program Details', 'icon': 'fa-tasks', 'intent': 'program_details', 'question': 'What will I do as an intern?'},
+    {'label': 'Preparation', 'icon': 'fa-book', 'intent': 'preparation', 'question': 'How should I prepare?'}
+]
+
+
+def load_faq_data(path):
+    """
+    Read FAQ data from a JSON or JSONL file.
+
+    A ``.json`` file maps each intent to ``{"questions": [...], "answers": [...]}``.
+    A ``.jsonl`` file holds one ``{"intent", "questions", "answers"}`` object per line.
+    """
+    with open(path, encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            faq_data = {}
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    faq_data[record['intent']] = {'questions': record['questions'], 'answers': record['answers']}
+        else:
+            faq_data = json.load(f)
+
+    for intent, data in faq_data.items():
+        if not data.get('questions') or not data.get('answers'):
+            raise ValueError(f"FAQ intent '{intent}' needs at least one question and one answer")
+    return faq_data
+
+
+_NO_FAILURE = object()
+
+
+def _file_signature(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class CompiledKnowledgeBase:
+    """
+    Precomputed form of the FAQ data: prompt fragments, lookup tables and BM25 indexes.
+
+    Never modified after construction; a reload builds a new instance and swaps it in whole.
+    """
+
+    def __init__(self, faq_data):
+        self.faq_data = faq_data
+        self.fragments = {
+            intent: f"Common questions: {', '.join(data['questions'][:2])}\n\nKey information: {data['answers'][0]}"
+            for intent, data in faq_data.items()
         }
-    
+        self.training_examples = [(question, intent) for intent, data in faq_data.items() for question in data['questions']]
+        self.training_examples.extend((topic['question'], topic['intent']) for topic in QUICK_TOPICS)
+
+        self.question_refs = []
+        self.answer_refs = []
+        self.answer_ids = {}
+        questions = []
+        answers = []
+        for intent, data in faq_data.items():
+            for position, question in enumerate(data['questions']):
+                self.question_refs.append((intent, position))
+                questions.append(question)
+            for position, answer in enumerate(data['answers']):
+                self.answer_ids.setdefault(intent, []).append(len(self.answer_refs))
+                self.answer_refs.append((intent, position))
+                answers.append(answer)
+        self.question_index = BM25Index(questions)
+        self.answer_index = BM25Index(answers)
+
+    def to_dict(self):
+        """
+        Plain-data form of the compiled tables, for snapshots
+        """
+        return {
+            'faq_data': self.faq_data,
+            'fragments': self.fragments,
+            'training_examples': self.training_examples,
+            'question_refs': self.question_refs,
+            'answer_refs': self.answer_refs,
+            'answer_ids': self.answer_ids,
+            'question_index': self.question_index.to_dict(),
+            'answer_index': self.answer_index.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        compiled = cls.__new__(cls)
+        compiled.faq_data = data['faq_data']
+        compiled.fragments = data['fragments']
+        compiled.training_examples = [tuple(example) for example in data['training_examples']]
+        compiled.question_refs = [tuple(ref) for ref in data['question_refs']]
+        compiled.answer_refs = [tuple(ref) for ref in data['answer_refs']]
+        compiled.answer_ids = data['answer_ids']
+        compiled.question_index = BM25Index.from_dict(data['question_index'])
+        compiled.answer_index = BM25Index.from_dict(data['answer_index'])
+        return compiled
+
+
+class InternshipKnowledgeBase:
+    """
+    FAQ knowledge base loaded from a data file and compiled for fast lookups.
+
+    The compiled tables are cached in a JSON snapshot next to the data file,
+    so later starts skip compilation while the file is unchanged. The snapshot
+    holds plain data only, so loading it never runs code. When
+    ``reload_interval`` is set, a background thread watches the file and swaps
+    in a freshly compiled knowledge base when it changes. Requests in flight
+    keep using the version they started with. A child forked from the
+    process starts its own watcher.
+    """
+
+    def __init__(self, path=None, snapshot_path=None, reload_interval=None):
+        self.path = path or DEFAULT_KB_PATH
+        self.snapshot_path = snapshot_path if snapshot_path is not None else self.path + '.snapshot'
+        self._listeners = []
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._reload_interval = reload_interval
+
+        self._signature = _file_signature(self.path)
+        # Signature of the last version that failed to load; a missing file has signature None
+        self._failed_signature = _NO_FAILURE
+        # Incremented on every reload, so derived data can tell which version it came from
+        self.version = 0
+        self._compiled = self._load_snapshot(self._signature)
+        if self._compiled is None:
+            self._compiled = CompiledKnowledgeBase(load_faq_data(self.path))
+            self._save_snapshot(self._compiled, self._signature)
+
+        self._start_watcher()
+        register_after_fork(self, in_child=InternshipKnowledgeBase._restart_in_child)
+
+    @property
+    def faq_data(self):
+        return self._compiled.faq_data
+
+    def on_reload(self, callback):
+        """
+        Register a function called with the new compiled knowledge base after each reload
+        """
+        self._listeners.append(callback)
+
+    def reload(self):
+        """
+        Recompile the data file and swap it in if it changed. Returns True when a new version was loaded.
+        """
+        with self._reload_lock:
+            try:
+                signature = _file_signature(self.path)
+            except FileNotFoundError:
+                signature = None
+            if signature == self._signature or signature == self._failed_signature:
+                return False
+            try:
+                compiled = CompiledKnowledgeBase(load_faq_data(self.path))
+            except Exception:
+                # Remember the broken version so it is reported once, not on every poll
+                self._failed_signature = signature
+                raise
+            # A single reference assignment, so readers see either the old or the new version
+            self._compiled = compiled
+            self.version += 1
+            self._signature = signature
+            self._save_snapshot(compiled, signature)
+
+        logger.info("Reloaded knowledge base from %s (%d intents)", self.path, len(compiled.faq_data))
+        for callback in self._listeners:
+            try:
+                callback(compiled)
+            except Exception as e:
+                logger.error("Knowledge base reload listener failed: %s", e)
+        return True
+
+    def close(self):
+        """
+        Stop watching the data file
+        """
+        self._stop.set()
+
+    def _start_watcher(self):
+        if self._reload_interval:
+            watcher = threading.Thread(target=self._watch, args=(self._reload_interval,), name='kb-reload', daemon=True)
+            watcher.start()
+
+    def _restart_in_child(self):
+        # The watcher thread did not survive the fork, and a reload may have held the lock
+        self._reload_lock = threading.Lock()
+        if not self._stop.is_set():
+            self._stop = threading.Event()
+            self._start_watcher()
+
+    def _watch(self, interval):
+        while not self._stop.wait(interval):
+            try:
+                self.reload()
+            except Exception as e:
+                # Keep serving the previous version until the file is fixed
+                logger.error("Knowledge base reload failed: %s", e)
+
+    def _load_snapshot(self, signature):
+        if not self.snapshot_path:
+            return None
+        try:
+            with open(self.snapshot_path, encoding='utf-8') as f:
+                snapshot = json.load(f)
+            if snapshot.get('version') != SNAPSHOT_VERSION or tuple(snapshot.get('source') or ()) != signature:
+                return None
+            return CompiledKnowledgeBase.from_dict(snapshot['compiled'])
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Ignoring unreadable knowledge base snapshot: %s", e)
+            return None
+
+    def _save_snapshot(self, compiled, signature):
+        if not self.snapshot_path:
+            return
+        snapshot = {'version': SNAPSHOT_VERSION, 'source': signature, 'compiled': compiled.to_dict()}
+        temporary_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, separators=(',', ':'))
+            os.replace(temporary_path, self.snapshot_path)
+        except OSError as e:
+            logger.warning("Could not write knowledge base snapshot: %s", e)
+
     def get_faq_by_intent(self, intent):
         """
         Get relevant FAQ information for a given intent
         """
-        if intent in self.faq_data:
-            faq = self.faq_data[intent]
-            return f"Common questions: {', '.join(faq['questions'][:2])}\n\nKey information: {faq['answers'][0]}"
-        else:
-            return "I can help with questions about internship applications, requirements, timelines, compensation, and more!"
+        return self._compiled.fragments.get(intent, DEFAULT_FAQ_CONTEXT)
+    
+    def training_examples(self):
+        """
+        Labelled (question, intent) pairs for training the local intent classifier
+        """
+        return list(self._compiled.training_examples)
     
-    def search_faqs(self, query):
+    def search_faqs(self, query, top_k=3):
         """
-        Search for relevant FAQs based on query
+        Search for relevant FAQs based on query, ranked by BM25 score
         """
-        query_lower = query.lower()
-        relevant_faqs = []
+        kb = self._compiled
+
+        # Best matching question per intent
+        best_questions = {}
+        for doc_id, score in kb.question_index.score(query).items():
+            intent, position = kb.question_refs[doc_id]
+            if score > best_questions.get(intent, (None, 0.0))[1]:
+                best_questions[intent] = (position, score)
+        
+        # An answer scores on its own text plus its intent's best question match
+        combined = kb.answer_index.score(query)
+        for intent, (_, question_score) in best_questions.items():
+            for doc_id in kb.answer_ids.get(intent, []):
+                combined[doc_id] = combined.get(doc_id, 0.0) + question_score
         
-        for intent, data in self.faq_data.items():
-            for question in data['questions']:
-                if any(word in question.lower() for word in query_lower.split()):
-                    relevant_faqs.append({
-                        'intent': intent,
-                        'question': question,
-                        'answer': data['answers'][0]
-                    })
+        ranked = []
+        for doc_id, score in heapq.nlargest(top_k, combined.items(), key=lambda item: item[1]):
+            intent, position = kb.answer_refs[doc_id]
+            question_position = best_questions.get(intent, (0, 0.0))[0]
+            ranked.append({
+                'intent': intent,
+                'question': kb.faq_data[intent]['questions'][question_position],
+                'answer': kb.faq_data[intent]['answers'][position],
+                'score': round(score, 4)
+            })
         
-        return relevant_faqs[:3]  # Return top 3 matches
+        return ranked
+    
+    def best_answer(self, intent, query):
+        """
+        Return the answer within an intent that best matches the query
+        """
+        kb = self._compiled
+        if intent not in kb.faq_data:
+            # The intent was removed by a reload since the caller checked it
+            return DEFAULT_FAQ_CONTEXT
+        answers = kb.faq_data[intent]['answers']
+        best_position = 0
+        best_score = 0.0
+        for doc_id, score in kb.answer_index.score(query).items():
+            answer_intent, position = kb.answer_refs[doc_id]
+            if answer_intent == intent and score > best_score:
+                best_position = position
+                best_score = score
+        return answers[best_position]
@@ -0,0 +1,71 @@
+import asyncio
+import threading
+import time
+
+
+class RateLimitExceeded(TimeoutError):
+    """
+    Raised when a token does not become available before the deadline
+    """
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting how often an operation may run.
+
+    Tokens refill continuously at ``rate`` per second, up to ``capacity``,
+    which allows short bursts. A rate of 0 or less disables limiting.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self):
+        """
+        Take a token if one is available. Returns 0 on success, otherwise the seconds until one will be.
+        """
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, timeout=None):
+        """
+        Block until a token is available, raising RateLimitExceeded after ``timeout`` seconds
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise RateLimitExceeded("Upstream rate limit: no capacity before the deadline")
+            time.sleep(wait)
+
+    async def acquire_async(self, timeout=None):
+        """
+        Wait for a token without blocking the event loop
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise RateLimitExceeded("Upstream rate limit: no capacity before the deadline")
+            await asyncio.sleep(wait)
+
+    def stats(self):
+        with self._lock:
+            tokens = min(self.capacity, self._tokens + (time.monotonic() - self._updated) * self.rate)
+        return {'rate': self.rate, 'capacity': self.capacity, 'available': round(tokens, 2)}
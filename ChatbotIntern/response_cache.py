@@ -0,0 +1,198 @@
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from sqlite_connection import ProcessLocalConnection
+from tokenizer import normalize_text
+
+# Words that usually point back at earlier turns ("tell me more about that")
+FOLLOW_UP_PATTERN = re.compile(
+    r"\b(it|its|that|this|these|those|they|them|their|more|also|else|another|again|"
+    r"elaborate|example|examples|why|same|above|previous|earlier)\b"
+)
+
+
+def is_follow_up(message, conversation_context):
+    """
+    Return True if a message likely depends on earlier conversation turns
+    """
+    # The current message is already the last entry of the context
+    if len(conversation_context) <= 1:
+        return False
+    normalized = normalize_text(message)
+    return len(normalized.split()) < 3 or bool(FOLLOW_UP_PATTERN.search(normalized))
+
+
+class MemoryCacheBackend:
+    """
+    In-process LRU store bounded by entry count and total payload bytes
+    """
+
+    def __init__(self, max_entries=1000, max_bytes=4 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, now):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            payload, expires_at = entry
+            if expires_at <= now:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    def set(self, key, payload, expires_at):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (payload, expires_at)
+            self._bytes += len(payload)
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _remove(self, key):
+        payload, _ = self._entries.pop(key)
+        self._bytes -= len(payload)
+
+
+class DiskCacheBackend:
+    """
+    SQLite-backed LRU store that survives process restarts.
+
+    The database runs in WAL mode and writes take the write lock up front, so
+    several worker processes on one host can share a single cache file.
+    """
+
+    def __init__(self, path, max_entries=10000, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._database = ProcessLocalConnection(path, (
+            "CREATE TABLE IF NOT EXISTS response_cache ("
+            "key TEXT PRIMARY KEY, payload TEXT NOT NULL, size INTEGER NOT NULL, "
+            "expires_at REAL NOT NULL, last_access REAL NOT NULL)",
+            "CREATE INDEX IF NOT EXISTS response_cache_lru ON response_cache (last_access)"
+        ))
+
+    @property
+    def _connection(self):
+        return self._database.get()
+
+    def get(self, key, now):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT payload, expires_at FROM response_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._connection.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+                return None
+            self._connection.execute("UPDATE response_cache SET last_access = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def set(self, key, payload, expires_at):
+        now = time.time()
+        with self._lock:
+            # IMMEDIATE takes the write lock now, so eviction counts can't race other processes
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO response_cache (key, payload, size, expires_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, payload, len(payload), expires_at, now)
+                )
+                self._connection.execute("DELETE FROM response_cache WHERE expires_at <= ?", (now,))
+                self._evict_lru()
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute("DELETE FROM response_cache")
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM response_cache").fetchone()[0]
+
+    def _evict_lru(self):
+        count, total = self._connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM response_cache").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        # Walk entries from least recently used, deleting until both limits hold
+        doomed = []
+        for key, size in self._connection.execute("SELECT key, size FROM response_cache ORDER BY last_access"):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            count -= 1
+            total -= size
+        self._connection.executemany("DELETE FROM response_cache WHERE key = ?", doomed)
+
+
+class ResponseCache:
+    """
+    Answer cache keyed on the normalized message and its classified intent.
+
+    Normalization ignores case, whitespace and punctuation, so "Are internships
+    paid?" and "are internships paid" share an entry. Entries expire after
+    ``ttl`` seconds; the backend bounds size with LRU eviction.
+    """
+
+    def __init__(self, backend, ttl=3600):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def key(self, message, intent):
+        return f"{intent}:{normalize_text(message)}"
+
+    def get(self, message, intent):
+        """
+        Return the cached response for a message, or None
+        """
+        payload = self.backend.get(self.key(message, intent), time.time())
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(payload)
+
+    def set(self, message, intent, response):
+        self.backend.set(self.key(message, intent), json.dumps(response), time.time() + self.ttl)
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+            'entries': len(self.backend)
+        }
@@ -0,0 +1,74 @@
+import heapq
+import math
+
+from tokenizer import tokenize
+
+
+class BM25Index:
+    """
+    Inverted index with Okapi BM25 scoring.
+
+    Postings and per-document length norms are computed once when the index
+    is built; a query only touches the postings of its own terms, so search
+    cost depends on how many documents share those terms rather than on the
+    size of the collection.
+    """
+
+    def __init__(self, documents, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.size = len(documents)
+        self._postings = {}
+
+        lengths = [len(tokenize(text)) for text in documents]
+        average_length = (sum(lengths) / self.size) if self.size else 0.0
+        for doc_id, text in enumerate(documents):
+            frequencies = {}
+            for term in tokenize(text):
+                frequencies[term] = frequencies.get(term, 0) + 1
+            norm = k1 * (1 - b + b * lengths[doc_id] / average_length) if average_length else k1
+            for term, frequency in frequencies.items():
+                # Store the saturated term frequency so queries are a single multiply-add
+                weight = frequency * (k1 + 1) / (frequency + norm)
+                self._postings.setdefault(term, []).append((doc_id, weight))
+
+        self._idf = {
+            term: math.log(1 + (self.size - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self._postings.items()
+        }
+
+    def to_dict(self):
+        """
+        Plain-data form of the index, for snapshots
+        """
+        return {'k1': self.k1, 'b': self.b, 'size': self.size, 'postings': self._postings, 'idf': self._idf}
+
+    @classmethod
+    def from_dict(cls, data):
+        index = cls.__new__(cls)
+        index.k1 = data['k1']
+        index.b = data['b']
+        index.size = data['size']
+        index._postings = {term: [tuple(posting) for posting in postings] for term, postings in data['postings'].items()}
+        index._idf = data['idf']
+        return index
+
+    def score(self, query):
+        """
+        Return a {doc_id: score} mapping for every document matching the query
+        """
+        scores = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = self._idf[term]
+            for doc_id, weight in postings:
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * weight
+        return scores
+
+    def top_k(self, query, k):
+        """
+        Return up to k (doc_id, score) pairs ordered by descending score
+        """
+        return heapq.nlargest(k, self.score(query).items(), key=lambda item: item[1])
@@ -0,0 +1,183 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from conversation_context import ConversationContext
+from sqlite_connection import ProcessLocalConnection
+
+
+class SessionStore:
+    """
+    Thread-safe, memory-bounded store of per-session conversation context.
+
+    Sessions are kept in least-recently-used order. A session is evicted when
+    it has been idle for longer than ``idle_ttl`` seconds or when the store
+    grows beyond ``max_sessions`` entries, so memory stays bounded no matter
+    how many visitors the process sees. Each session's history is held in a
+    ``ConversationContext`` that keeps it within ``token_budget`` tokens.
+    """
+
+    def __init__(self, max_sessions=10000, idle_ttl=1800, token_budget=600, summary_budget=150, max_message_chars=4000):
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.token_budget = token_budget
+        self.summary_budget = summary_budget
+        self.max_message_chars = max_message_chars
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_context(self, session_id):
+        """
+        Return a copy of the conversation context for a session
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._evict_expired(now)
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return self._new_context()
+            entry['last_access'] = now
+            self._sessions.move_to_end(session_id)
+            return entry['context'].copy()
+
+    def append(self, session_id, role, content):
+        """
+        Append a message to a session, creating the session if needed
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._evict_expired(now)
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                entry = {'context': self._new_context(), 'last_access': now}
+                self._sessions[session_id] = entry
+            else:
+                self._sessions.move_to_end(session_id)
+            entry['last_access'] = now
+            entry['context'].append(role, content[:self.max_message_chars])
+
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+    def reset(self, session_id):
+        """
+        Drop all context for a session
+        """
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+    def _new_context(self):
+        return ConversationContext(self.token_budget, self.summary_budget)
+
+    def _evict_expired(self, now):
+        # Sessions are ordered by last access, so expired ones sit at the front
+        while self._sessions:
+            session_id, entry = next(iter(self._sessions.items()))
+            if now - entry['last_access'] <= self.idle_ttl:
+                break
+            del self._sessions[session_id]
+
+
+class DiskSessionStore:
+    """
+    SQLite-backed session store shared by every worker process on a host.
+
+    The database runs in WAL mode, so readers never wait for the writer. Each
+    append is one IMMEDIATE transaction that reads the context, adds the
+    message and writes it back, so workers handling the same conversation
+    never lose a turn. Eviction matches SessionStore: sessions idle for
+    ``idle_ttl`` seconds are dropped, then the least recently used ones
+    beyond ``max_sessions``.
+    """
+
+    def __init__(self, path, max_sessions=10000, idle_ttl=1800, token_budget=600, summary_budget=150, max_message_chars=4000):
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.token_budget = token_budget
+        self.summary_budget = summary_budget
+        self.max_message_chars = max_message_chars
+        self._lock = threading.Lock()
+        self._database = ProcessLocalConnection(path, (
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "session_id TEXT PRIMARY KEY, state TEXT NOT NULL, last_access REAL NOT NULL)",
+            "CREATE INDEX IF NOT EXISTS sessions_lru ON sessions (last_access)"
+        ))
+
+    @property
+    def _connection(self):
+        return self._database.get()
+
+    def get_context(self, session_id):
+        """
+        Return a copy of the conversation context for a session
+        """
+        # Wall-clock time, since last_access is compared across processes
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT state, last_access FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is None or now - row[1] > self.idle_ttl:
+                return self._new_context()
+            self._connection.execute("UPDATE sessions SET last_access = ? WHERE session_id = ?", (now, session_id))
+        return self._load_context(row[0])
+
+    def append(self, session_id, role, content):
+        """
+        Append a message to a session, creating the session if needed
+        """
+        now = time.time()
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._connection.execute(
+                    "SELECT state, last_access FROM sessions WHERE session_id = ?", (session_id,)
+                ).fetchone()
+                if row is None or now - row[1] > self.idle_ttl:
+                    context = self._new_context()
+                else:
+                    context = self._load_context(row[0])
+                context.append(role, content[:self.max_message_chars])
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO sessions (session_id, state, last_access) VALUES (?, ?, ?)",
+                    (session_id, json.dumps(context.to_dict()), now)
+                )
+                self._connection.execute("DELETE FROM sessions WHERE last_access < ?", (now - self.idle_ttl,))
+                self._evict_lru()
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+
+    def reset(self, session_id):
+        """
+        Drop all context for a session
+        """
+        with self._lock:
+            self._connection.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM sessions WHERE last_access >= ?", (time.time() - self.idle_ttl,)
+            ).fetchone()[0]
+
+    def _new_context(self):
+        return ConversationContext(self.token_budget, self.summary_budget)
+
+    def _load_context(self, state):
+        return ConversationContext.from_dict(json.loads(state), self.token_budget, self.summary_budget)
+
+    def _evict_lru(self):
+        excess = self._connection.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] - self.max_sessions
+        if excess > 0:
+            self._connection.execute(
+                "DELETE FROM sessions WHERE session_id IN "
+                "(SELECT session_id FROM sessions ORDER BY last_access LIMIT ?)",
+                (excess,)
+            )
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls into one in-flight execution.
+
+    The first caller for a key runs the function; callers arriving with the
+    same key while it is running wait for it and receive the same result, or
+    the same exception if it failed. Nothing is cached once the call returns.
+    """
+
+    def __init__(self):
+        self.executed = 0
+        self.shared = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, timeout=None):
+        """
+        Run fn() once per key at a time and return its result to every caller.
+
+        Waiting callers raise TimeoutError if the in-flight call has not
+        finished within ``timeout`` seconds; the call itself keeps running.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+            else:
+                self.shared += 1
+
+        if leader:
+            try:
+                call.result = fn()
+            except Exception as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        elif not call.done.wait(timeout):
+            raise TimeoutError(f"Timed out waiting for in-flight call after {timeout}s")
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def stats(self):
+        with self._lock:
+            return {
+                'executed': self.executed,
+                'shared': self.shared,
+                'in_flight': len(self._calls)
+            }
+
+
+class AsyncSingleFlight:
+    """
+    asyncio counterpart of SingleFlight for coroutine functions.
+
+    The shared call runs as its own task, so a waiter timing out or being
+    cancelled does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self.executed = 0
+        self.shared = 0
+        self._calls = {}
+
+    async def do(self, key, fn, timeout=None):
+        """
+        Await fn() once per key at a time and return its result to every caller
+        """
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self.executed += 1
+        else:
+            self.shared += 1
+        return await asyncio.wait_for(asyncio.shield(task), timeout)
+
+    def stats(self):
+        return {
+            'executed': self.executed,
+            'shared': self.shared,
+            'in_flight': len(self._calls)
+        }
+
+    def _finish(self, key, task):
+        self._calls.pop(key, None)
+        # Mark the exception as retrieved even if every waiter has gone away
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,33 @@
+import os
+import sqlite3
+
+
+class ProcessLocalConnection:
+    """
+    SQLite connection that is opened lazily, once per process.
+
+    A SQLite connection must not be used on both sides of a fork, so when a
+    server forks workers from a preloaded parent (e.g. ``gunicorn --preload``)
+    each worker opens its own connection on first use instead of inheriting
+    the parent's. ``schema`` statements run on every new connection and must
+    be idempotent. Callers serialize access themselves.
+    """
+
+    def __init__(self, path, schema=()):
+        self.path = path
+        self.schema = schema
+        self._pid = None
+        self._connection = None
+
+    def get(self):
+        pid = os.getpid()
+        if self._pid != pid:
+            connection = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            for statement in self.schema:
+                connection.execute(statement)
+            # The parent's connection is left alone; closing it here could disturb the parent's locks
+            self._connection = connection
+            self._pid = pid
+        return self._connection
@@ -38,28 +38,45 @@ function sendMessage() {
     isWaitingForResponse = true;
     updateSendButton(false);
     
-    // Send message to server
-    fetch('/chat', {
+    // Stream the response from the server as server-sent events
+    let botMessage = null;
+    let responseText = '';
+    
+    fetch('/chat/stream', {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json',
         },
         body: JSON.stringify({ message: message })
     })
-    .then(response => response.json())
-    .then(data => {
-        hideTypingIndicator();
-        
-        if (data.response) {
-            addMessageToChat(data.response, 'bot', data.intent, data.confidence);
-        } else {
-            addMessageToChat('Sorry, I encountered an error. Please try again.', 'bot', 'error');
+    .then(response => {
+        if (!response.ok || !response.body) {
+            throw new Error(`Unexpected response: ${response.status}`);
         }
+        return readEventStream(response.body, (event, data) => {
+            if (event === 'intent') {
+                hideTypingIndicator();
+                botMessage = addMessageToChat('', 'bot', data.intent, null);
+            } else if (event === 'token') {
+                responseText += data.text;
+                updateBotMessage(botMessage, responseText);
+            } else if (event === 'done') {
+                finishBotMessage(botMessage, data.confidence);
+            } else if (event === 'error') {
+                hideTypingIndicator();
+                if (botMessage) {
+                    botMessage.remove();
+                }
+                addMessageToChat(data.response || 'Sorry, I encountered an error. Please try again.', 'bot', 'error');
+            }
+        });
     })
     .catch(error => {
         console.error('Error:', error);
         hideTypingIndicator();
-        addMessageToChat('Sorry, I encountered a connection error. Please check your internet connection and try again.', 'bot', 'error');
+        if (!responseText) {
+            addMessageToChat('Sorry, I encountered a connection error. Please check your internet connection and try again.', 'bot', 'error');
+        }
     })
     .finally(() => {
         isWaitingForResponse = false;
@@ -68,6 +85,65 @@ function sendMessage() {
     });
 }
 
+async function readEventStream(body, onEvent) {
+    // Parse a text/event-stream body, calling onEvent(event, data) per message
+    const reader = body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) {
+            break;
+        }
+        buffer += decoder.decode(value, { stream: true });
+        
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const rawEvent = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+            
+            let event = 'message';
+            let data = '';
+            for (const line of rawEvent.split('\n')) {
+                if (line.startsWith('event: ')) {
+                    event = line.slice(7);
+                } else if (line.startsWith('data: ')) {
+                    data += line.slice(6);
+                }
+            }
+            if (data) {
+                onEvent(event, JSON.parse(data));
+            }
+        }
+    }
+}
+
+function updateBotMessage(messageDiv, text) {
+    const body = messageDiv.querySelector('.message-body');
+    body.innerHTML = formatMessage(text);
+    
+    const chatMessages = document.getElementById('chatMessages');
+    chatMessages.scrollTop = chatMessages.scrollHeight;
+}
+
+function finishBotMessage(messageDiv, confidence) {
+    const contentDiv = messageDiv.querySelector('.message-content');
+    
+    if (confidence > 0.8) {
+        contentDiv.classList.add('confidence-high');
+    } else if (confidence > 0.5) {
+        contentDiv.classList.add('confidence-medium');
+    } else {
+        contentDiv.classList.add('confidence-low');
+    }
+    
+    // Show confidence indicator for debugging (only for low confidence)
+    if (confidence < 0.5) {
+        contentDiv.insertAdjacentHTML('beforeend', `<div class="message-meta">Confidence: ${Math.round(confidence * 100)}%</div>`);
+    }
+}
+
 function askQuestion(question) {
     const messageInput = document.getElementById('messageInput');
     messageInput.value = question;
@@ -108,7 +184,7 @@ function addMessageToChat(message, sender, intent = null, confidence = null) {
             botContent += `<span class="intent-badge intent-${intent}">${formatIntent(intent)}</span><br>`;
         }
         
-        botContent += `<div>${formatMessage(message)}</div>`;
+        botContent += `<div class="message-body">${formatMessage(message)}</div>`;
         
         // Add confidence indicator for debugging (only show for low confidence)
         if (confidence !== null && confidence < 0.5) {
@@ -123,6 +199,8 @@ function addMessageToChat(message, sender, intent = null, confidence = null) {
     
     // Scroll to bottom
     chatMessages.scrollTop = chatMessages.scrollHeight;
+    
+    return messageDiv;
 }
 
 function showTypingIndicator() {
@@ -0,0 +1,32 @@
+import os
+import sys
+import time
+
+import pytest
+
+# The app modules live next to this directory and import each other by bare name
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeClock:
+    """
+    Stands in for time.monotonic, time.time and time.sleep; sleeping advances the clock
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(time, 'monotonic', clock)
+    monkeypatch.setattr(time, 'time', clock)
+    monkeypatch.setattr(time, 'sleep', clock.sleep)
+    return clock
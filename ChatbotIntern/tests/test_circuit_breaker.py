@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+def fail():
+    raise ValueError("upstream down")
+
+
+def trip(breaker):
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(ValueError):
+            breaker.call(fail)
+
+
+def test_trips_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=10)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            breaker.call(fail)
+    assert breaker.state == 'closed'
+
+    with pytest.raises(ValueError):
+        breaker.call(fail)
+    assert breaker.state == 'open'
+
+    calls = []
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: calls.append(1))
+    assert calls == []
+    assert breaker.stats()['rejected'] == 1
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=2)
+    with pytest.raises(ValueError):
+        breaker.call(fail)
+    breaker.call(lambda: 'ok')
+    with pytest.raises(ValueError):
+        breaker.call(fail)
+    assert breaker.state == 'closed'
+
+
+def test_stays_open_until_recovery_timeout(clock):
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+    trip(breaker)
+
+    clock.now += 9.9
+    assert breaker.state == 'open'
+    clock.now += 0.1
+    assert breaker.state == 'half_open'
+
+
+def test_half_open_probe_success_closes(clock):
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=10)
+    trip(breaker)
+
+    clock.now += 10
+    assert breaker.state == 'half_open'
+    assert breaker.call(lambda: 'ok') == 'ok'
+    assert breaker.state == 'closed'
+    assert breaker.stats()['consecutive_failures'] == 0
+
+
+def test_half_open_probe_failure_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=10)
+    trip(breaker)
+
+    clock.now += 10
+    with pytest.raises(ValueError):
+        breaker.call(fail)
+    assert breaker.state == 'open'
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: 'ok')
+
+
+def test_half_open_allows_one_probe_at_a_time(clock):
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+    trip(breaker)
+
+    clock.now += 10
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+
+def test_cancelled_probe_frees_its_slot(clock):
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+    trip(breaker)
+    clock.now += 10
+
+    async def hang():
+        await asyncio.sleep(60)
+
+    async def scenario():
+        task = asyncio.ensure_future(breaker.call_async(hang))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        # The next caller gets to probe and its success closes the circuit
+        async def ok():
+            return 'ok'
+        return await breaker.call_async(ok)
+
+    assert asyncio.run(scenario()) == 'ok'
+    assert breaker.state == 'closed'
+
+
+def test_cancellation_while_closed_is_not_a_failure(clock):
+    breaker = CircuitBreaker(failure_threshold=1)
+
+    async def scenario():
+        task = asyncio.ensure_future(breaker.call_async(lambda: asyncio.sleep(60)))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    assert breaker.state == 'closed'
@@ -0,0 +1,82 @@
+from conversation_context import ConversationContext, estimate_tokens
+
+
+def message(words):
+    return ' '.join(f"word{i}" for i in range(words))
+
+
+def test_estimate_tokens_is_about_four_characters_each():
+    assert estimate_tokens('') == 1
+    assert estimate_tokens('abcd') == 1
+    assert estimate_tokens('abcde') == 2
+
+
+def test_keeps_everything_under_budget():
+    context = ConversationContext(token_budget=100)
+    context.append('user', 'hello')
+    context.append('assistant', 'hi there')
+    assert [m['content'] for m in context.messages] == ['hello', 'hi there']
+    assert not context.summary_lines
+    assert context.render() == "user: hello\nassistant: hi there"
+
+
+def test_folds_oldest_messages_into_the_summary():
+    context = ConversationContext(token_budget=20, summary_budget=1000)
+    for i in range(5):
+        context.append('user', f"question {i} " + message(5))
+
+    assert context.history_tokens <= 20
+    assert context.history_tokens == sum(m['tokens'] for m in context.messages)
+    assert len(context.messages) + len(context.summary_lines) == 5
+    assert context.summary_lines[0][0].startswith("User asked: question 0")
+    assert context.render().startswith("Earlier in the conversation: User asked: question 0")
+    assert len(context) == 5
+
+
+def test_summary_lines_are_truncated_to_summary_words():
+    context = ConversationContext(token_budget=1, summary_words=3)
+    context.append('assistant', 'one two three four five')
+    context.append('user', 'next')
+    assert context.summary_lines[0][0] == "Assistant answered: one two three..."
+
+
+def test_summary_is_capped_at_its_budget():
+    context = ConversationContext(token_budget=10, summary_budget=30)
+    for i in range(50):
+        context.append('user', f"message {i} " + message(8))
+
+    assert context.summary_tokens <= 30
+    assert context.summary_tokens == sum(tokens for _, tokens in context.summary_lines)
+    # The newest folded messages survive, the oldest are gone
+    assert "message 0 " not in context.render()
+    assert len(context) == 50
+
+
+def test_newest_message_is_kept_even_over_budget():
+    context = ConversationContext(token_budget=5)
+    context.append('user', message(50))
+    assert len(context.messages) == 1
+    assert context.token_count > 5
+
+
+def test_copy_is_independent():
+    context = ConversationContext()
+    context.append('user', 'hello')
+    clone = context.copy()
+    clone.append('assistant', 'hi')
+    assert len(context.messages) == 1
+    assert len(clone.messages) == 2
+
+
+def test_dict_round_trip():
+    context = ConversationContext(token_budget=20, summary_budget=40)
+    for i in range(6):
+        context.append('user', f"turn {i} " + message(4))
+
+    restored = ConversationContext.from_dict(context.to_dict(), token_budget=20, summary_budget=40)
+    assert restored.render() == context.render()
+    assert restored.token_count == context.token_count
+    assert len(restored) == len(context)
+    restored.append('assistant', 'more')
+    context.append('assistant', 'more')
+    assert restored.render() == context.render()
@@ -0,0 +1,68 @@
+import pytest
+
+from keyword_matcher import KeywordMatcher
+
+KEYWORDS = {
+    'application_process': ['apply', 'application', 'submit', 'cover letter'],
+    'compensation': ['pay', 'paid', 'salary', 'stipend'],
+    'location': ['where', 'remote', 'work from home'],
+    'selection_process': ['interview', 'selection', 'test'],
+    'program_details': ['projects', 'mentor'],
+    'preparation': ['prepare', 'tips'],
+    'greeting': ['hello', 'hi'],
+}
+
+
+@pytest.fixture(scope='module')
+def matcher():
+    return KeywordMatcher(KEYWORDS)
+
+
+def best_intent(matcher, message):
+    scores, _ = matcher.match(message)
+    intent = max(scores, key=scores.get)
+    return intent if scores[intent] else None
+
+
+def test_short_keywords_need_whole_words(matcher):
+    assert best_intent(matcher, "Is this program any good?") is None
+    assert best_intent(matcher, "What about his application?") == 'application_process'
+    assert matcher.match("Hi there")[1] == ['hi']
+
+
+def test_keywords_do_not_match_inside_other_words(matcher):
+    assert best_intent(matcher, "What is the latest news?") is None
+    assert best_intent(matcher, "There is a test on day one") == 'selection_process'
+
+
+def test_matched_terms_are_reported_once_in_order(matcher):
+    scores, terms = matcher.match("Do interviews pay? What does the interview pay?")
+    assert terms == ['interview', 'pay']
+    assert scores['selection_process'] == 1
+    assert scores['compensation'] == 1
+
+
+def test_multi_word_keywords(matcher):
+    assert matcher.match("Can I work from home?")[1] == ['work from home']
+
+
+@pytest.mark.parametrize('message, intent, term', [
+    ("Can I work remotely for the summer?", 'location', 'remote'),
+    ("Is there mentorship?", 'program_details', 'mentor'),
+    ("Any advice on interviewing?", 'selection_process', 'interview'),
+    ("I'm applying next week", 'application_process', 'apply'),
+    ("She applied last year", 'application_process', 'apply'),
+    ("What should I be preparing?", 'preparation', 'prepare'),
+    ("Is the role paying?", 'compensation', 'pay'),
+    ("I submitted my form", 'application_process', 'submit'),
+    ("Where are the interviews?", 'selection_process', 'interview'),
+])
+def test_inflected_forms_match_their_keyword(matcher, message, intent, term):
+    scores, terms = matcher.match(message)
+    assert term in terms
+    assert scores[intent] >= 1
+
+
+def test_empty_keyword_table():
+    scores, terms = KeywordMatcher({}).match("hello")
+    assert (scores, terms) == ({}, [])
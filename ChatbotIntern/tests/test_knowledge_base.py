@@ -0,0 +1,121 @@
+import json
+import os
+
+import pytest
+
+import knowledge_base
+from knowledge_base import InternshipKnowledgeBase, load_faq_data
+
+FAQ = {
+    'compensation': {
+        'questions': ["Are internships paid?", "How much do interns earn?"],
+        'answers': ["Most internships are paid hourly.", "Stipends vary by company."]
+    },
+    'location': {
+        'questions': ["Can I work remotely?"],
+        'answers': ["Many programs offer remote or hybrid options."]
+    }
+}
+
+
+def write_faq(path, faq, mtime):
+    path.write_text(json.dumps(faq), encoding='utf-8')
+    # Set the timestamp explicitly so quick rewrites always change the file signature
+    os.utime(path, ns=(mtime, mtime))
+
+
+@pytest.fixture
+def faq_path(tmp_path):
+    path = tmp_path / 'faq.json'
+    write_faq(path, FAQ, 1_000_000_000)
+    return path
+
+
+def test_loads_json_lines(tmp_path):
+    path = tmp_path / 'faq.jsonl'
+    path.write_text(
+        '\n'.join(json.dumps({'intent': intent, **data}) for intent, data in FAQ.items()) + '\n\n',
+        encoding='utf-8'
+    )
+    assert load_faq_data(str(path)) == FAQ
+
+
+def test_rejects_intents_without_answers(tmp_path):
+    path = tmp_path / 'faq.json'
+    path.write_text(json.dumps({'empty': {'questions': ["Why?"], 'answers': []}}), encoding='utf-8')
+    with pytest.raises(ValueError):
+        load_faq_data(str(path))
+
+
+def test_snapshot_is_reused_while_the_file_is_unchanged(faq_path, monkeypatch):
+    first = InternshipKnowledgeBase(str(faq_path))
+    assert os.path.exists(str(faq_path) + '.snapshot')
+
+    def not_expected(path):
+        raise AssertionError("compiled from source despite a valid snapshot")
+    monkeypatch.setattr(knowledge_base, 'load_faq_data', not_expected)
+    second = InternshipKnowledgeBase(str(faq_path))
+
+    assert second.faq_data == first.faq_data
+    assert second.training_examples() == first.training_examples()
+    for query in ["are internships paid", "remote work", "earn money"]:
+        assert second.search_faqs(query) == first.search_faqs(query)
+    assert second.best_answer('compensation', "stipend") == "Stipends vary by company."
+
+
+def test_snapshot_is_ignored_when_the_file_changes(faq_path):
+    InternshipKnowledgeBase(str(faq_path))
+    changed = dict(FAQ, timeline={'questions': ["When should I apply?"], 'answers': ["In the fall."]})
+    write_faq(faq_path, changed, 2_000_000_000)
+
+    assert 'timeline' in InternshipKnowledgeBase(str(faq_path)).faq_data
+
+
+def test_corrupt_snapshot_falls_back_to_the_source(faq_path):
+    snapshot_path = str(faq_path) + '.snapshot'
+    InternshipKnowledgeBase(str(faq_path))
+    with open(snapshot_path, 'w', encoding='utf-8') as f:
+        f.write('{not json')
+
+    assert InternshipKnowledgeBase(str(faq_path), snapshot_path=snapshot_path).faq_data == FAQ
+
+
+def test_reload_swaps_in_changes_and_notifies_listeners(faq_path):
+    kb = InternshipKnowledgeBase(str(faq_path))
+    reloaded = []
+    kb.on_reload(reloaded.append)
+    assert not kb.reload()
+
+    changed = {'location': FAQ['location']}
+    write_faq(faq_path, changed, 2_000_000_000)
+    assert kb.reload()
+    assert kb.version == 1
+    assert kb.faq_data == changed
+    assert [compiled.faq_data for compiled in reloaded] == [changed]
+    assert kb.best_answer('compensation', "paid") == knowledge_base.DEFAULT_FAQ_CONTEXT
+
+
+def test_broken_file_fails_once_and_keeps_the_old_version(faq_path):
+    kb = InternshipKnowledgeBase(str(faq_path))
+    faq_path.write_text('{"broken": ', encoding='utf-8')
+    os.utime(faq_path, ns=(2_000_000_000, 2_000_000_000))
+
+    with pytest.raises(ValueError):
+        kb.reload()
+    # The same broken file is not parsed (or reported) again on every poll
+    assert not kb.reload()
+    assert kb.faq_data == FAQ
+    assert kb.version == 0
+
+    write_faq(faq_path, FAQ, 3_000_000_000)
+    assert kb.reload()
+    assert kb.version == 1
+
+
+def test_missing_file_fails_once(faq_path):
+    kb = InternshipKnowledgeBase(str(faq_path))
+    os.remove(faq_path)
+    with pytest.raises(FileNotFoundError):
+        kb.reload()
+    assert not kb.reload()
+    assert kb.faq_data == FAQ
@@ -0,0 +1,68 @@
+import pytest
+
+from metrics import Registry
+
+
+@pytest.fixture
+def registry():
+    return Registry()
+
+
+def test_counter_renders_help_type_and_labelled_samples(registry):
+    counter = registry.counter('responses_total', 'Responses by source', ['source'])
+    counter.inc(source='contextual')
+    counter.inc(2, source='cache')
+
+    assert registry.render() == (
+        "# HELP responses_total Responses by source\n"
+        "# TYPE responses_total counter\n"
+        'responses_total{source="cache"} 2\n'
+        'responses_total{source="contextual"} 1\n'
+    )
+
+
+def test_histogram_buckets_are_cumulative(registry):
+    histogram = registry.histogram('stage_seconds', 'Stage time', ['stage'], buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, stage='total')
+
+    lines = registry.render().splitlines()
+    assert lines[2:] == [
+        'stage_seconds_bucket{stage="total",le="0.1"} 2',
+        'stage_seconds_bucket{stage="total",le="1.0"} 3',
+        'stage_seconds_bucket{stage="total",le="+Inf"} 4',
+        'stage_seconds_sum{stage="total"} 3.65',
+        'stage_seconds_count{stage="total"} 4',
+    ]
+
+
+def test_histogram_time_observes_even_on_error(registry):
+    histogram = registry.histogram('stage_seconds', 'Stage time', ['stage'])
+    with pytest.raises(ValueError):
+        with histogram.time(stage='classification'):
+            raise ValueError("boom")
+    assert 'stage_seconds_count{stage="classification"} 1' in registry.render()
+
+
+def test_callback_metric_is_read_at_render_time(registry):
+    queued = [3]
+    registry.callback('queue_depth', 'Queued records', 'gauge', lambda: queued[0])
+    registry.callback('breaker_state', 'Breaker state', 'gauge', lambda: {('open',): 1, ('closed',): 0}, ['state'])
+    assert 'queue_depth 3' in registry.render()
+    queued[0] = 7
+
+    rendered = registry.render()
+    assert 'queue_depth 7' in rendered
+    assert 'breaker_state{state="closed"} 0\nbreaker_state{state="open"} 1' in rendered
+
+
+def test_label_values_are_escaped(registry):
+    counter = registry.counter('errors_total', 'Errors', ['message'])
+    counter.inc(message='say "hi"\nback\\slash')
+    assert r'errors_total{message="say \"hi\"\nback\\slash"} 1' in registry.render()
+
+
+def test_registering_a_name_again_replaces_the_metric(registry):
+    registry.counter('responses_total', 'Old').inc()
+    registry.counter('responses_total', 'New')
+    assert registry.render() == "# HELP responses_total New\n# TYPE responses_total counter\n"
@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from rate_limiter import RateLimitExceeded, TokenBucket
+
+
+def test_allows_a_burst_up_to_capacity(clock):
+    bucket = TokenBucket(rate=2, capacity=3)
+    assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.try_acquire() == pytest.approx(0.5)
+
+
+def test_refills_at_the_configured_rate(clock):
+    bucket = TokenBucket(rate=2, capacity=1)
+    assert bucket.try_acquire() == 0.0
+    clock.now += 0.25
+    assert bucket.try_acquire() == pytest.approx(0.25)
+    clock.now += 0.25
+    assert bucket.try_acquire() == 0.0
+
+
+def test_refill_is_capped_at_capacity(clock):
+    bucket = TokenBucket(rate=10, capacity=2)
+    clock.now += 60
+    assert bucket.stats()['available'] == 2
+
+
+def test_acquire_waits_for_a_token(clock):
+    bucket = TokenBucket(rate=4, capacity=1)
+    bucket.acquire()
+    started = clock.now
+    bucket.acquire(timeout=1)
+    assert clock.now - started == pytest.approx(0.25)
+
+
+def test_acquire_gives_up_when_the_wait_passes_the_deadline(clock):
+    bucket = TokenBucket(rate=1, capacity=1)
+    bucket.acquire()
+    started = clock.now
+    with pytest.raises(RateLimitExceeded):
+        bucket.acquire(timeout=0.5)
+    # Fails fast instead of sleeping until the deadline
+    assert clock.now == started
+
+
+def test_acquire_async_raises_past_the_deadline():
+    bucket = TokenBucket(rate=1, capacity=1)
+
+    async def scenario():
+        await bucket.acquire_async()
+        await bucket.acquire_async(timeout=0.1)
+
+    with pytest.raises(RateLimitExceeded):
+        asyncio.run(scenario())
+
+
+def test_zero_rate_is_unlimited():
+    bucket = TokenBucket(rate=0)
+    assert all(bucket.try_acquire() == 0.0 for _ in range(100))
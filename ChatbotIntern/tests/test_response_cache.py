@@ -0,0 +1,83 @@
+import pytest
+
+from conversation_context import ConversationContext
+from response_cache import DiskCacheBackend, MemoryCacheBackend, ResponseCache, is_follow_up
+
+
+@pytest.fixture(params=['memory', 'disk'])
+def make_backend(request, tmp_path):
+    def make(**options):
+        if request.param == 'disk':
+            return DiskCacheBackend(str(tmp_path / 'cache.db'), **options)
+        return MemoryCacheBackend(**options)
+    return make
+
+
+def conversation(*messages):
+    context = ConversationContext()
+    for role, content in messages:
+        context.append(role, content)
+    return context
+
+
+def test_key_ignores_case_whitespace_and_punctuation():
+    cache = ResponseCache(MemoryCacheBackend())
+    assert cache.key("Are internships paid?", 'compensation') == cache.key("  are INTERNSHIPS   paid ", 'compensation')
+    assert cache.key("Are internships paid?", 'compensation') != cache.key("Are internships paid?", 'timeline')
+
+
+def test_round_trip_and_stats(make_backend, clock):
+    cache = ResponseCache(make_backend())
+    assert cache.get("Are internships paid?", 'compensation') is None
+    cache.set("Are internships paid?", 'compensation', {'response': 'Yes', 'source': 'contextual'})
+    assert cache.get("are internships paid", 'compensation') == {'response': 'Yes', 'source': 'contextual'}
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'hit_rate': 0.5, 'entries': 1}
+
+
+def test_entries_expire_after_ttl(make_backend, clock):
+    cache = ResponseCache(make_backend(), ttl=60)
+    cache.set("hello", 'greeting', {'response': 'Hi'})
+    clock.now += 59
+    assert cache.get("hello", 'greeting') is not None
+    clock.now += 1
+    assert cache.get("hello", 'greeting') is None
+
+
+def test_evicts_least_recently_used_by_count(make_backend, clock):
+    backend = make_backend(max_entries=2)
+    backend.set('a', '1', clock.now + 60)
+    clock.now += 1
+    backend.set('b', '2', clock.now + 60)
+    clock.now += 1
+    assert backend.get('a', clock.now) == '1'
+    clock.now += 1
+    backend.set('c', '3', clock.now + 60)
+
+    assert len(backend) == 2
+    assert backend.get('b', clock.now) is None
+    assert backend.get('a', clock.now) == '1'
+
+
+def test_evicts_to_stay_within_bytes(make_backend, clock):
+    backend = make_backend(max_bytes=10)
+    backend.set('a', 'x' * 6, clock.now + 60)
+    clock.now += 1
+    backend.set('b', 'y' * 6, clock.now + 60)
+    assert backend.get('a', clock.now) is None
+    assert backend.get('b', clock.now) == 'y' * 6
+
+
+def test_first_message_is_never_a_follow_up():
+    assert not is_follow_up("Tell me more about it", conversation(('user', "Tell me more about it")))
+
+
+@pytest.mark.parametrize('message', ["Tell me more about that", "Why?", "Is there another one", "Can you give an example"])
+def test_follow_ups_bypass_the_cache(message):
+    context = conversation(('user', "Are internships paid?"), ('assistant', "Yes."), ('user', message))
+    assert is_follow_up(message, context)
+
+
+def test_standalone_questions_later_in_a_conversation_are_cacheable():
+    message = "What is the application deadline?"
+    context = conversation(('user', "Are internships paid?"), ('assistant', "Yes."), ('user', message))
+    assert not is_follow_up(message, context)
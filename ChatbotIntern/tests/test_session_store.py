@@ -0,0 +1,96 @@
+import multiprocessing
+
+import pytest
+
+from session_store import DiskSessionStore, SessionStore
+
+
+@pytest.fixture(params=['memory', 'disk'])
+def make_store(request, tmp_path):
+    def make(**options):
+        if request.param == 'disk':
+            return DiskSessionStore(str(tmp_path / 'sessions.db'), **options)
+        return SessionStore(**options)
+    return make
+
+
+def messages(store, session_id):
+    return [message['content'] for message in store.get_context(session_id).messages]
+
+
+def test_append_builds_the_conversation(make_store):
+    store = make_store()
+    store.append('s', 'user', 'hello')
+    store.append('s', 'assistant', 'hi there')
+    assert messages(store, 's') == ['hello', 'hi there']
+    assert messages(store, 'other') == []
+
+
+def test_get_context_returns_a_copy(make_store):
+    store = make_store()
+    store.append('s', 'user', 'hello')
+    store.get_context('s').append('user', 'not stored')
+    assert messages(store, 's') == ['hello']
+
+
+def test_long_messages_are_truncated(make_store):
+    store = make_store(max_message_chars=5)
+    store.append('s', 'user', 'abcdefghij')
+    assert messages(store, 's') == ['abcde']
+
+
+def test_evicts_least_recently_used_first(make_store, clock):
+    store = make_store(max_sessions=2)
+    store.append('a', 'user', 'one')
+    clock.now += 1
+    store.append('b', 'user', 'two')
+    clock.now += 1
+    # Reading a session counts as a use
+    store.get_context('a')
+    clock.now += 1
+    store.append('c', 'user', 'three')
+
+    assert len(store) == 2
+    assert messages(store, 'a') == ['one']
+    assert messages(store, 'b') == []
+    assert messages(store, 'c') == ['three']
+
+
+def test_idle_sessions_expire(make_store, clock):
+    store = make_store(idle_ttl=60)
+    store.append('s', 'user', 'hello')
+    clock.now += 59
+    assert messages(store, 's') == ['hello']
+    clock.now += 61
+    assert messages(store, 's') == []
+    assert len(store) == 0
+
+
+def test_reset_drops_the_session(make_store):
+    store = make_store()
+    store.append('s', 'user', 'hello')
+    store.reset('s')
+    assert messages(store, 's') == []
+
+
+def _append_many(path, worker, count):
+    store = DiskSessionStore(path)
+    for i in range(count):
+        store.append('shared', 'user', f"{worker}-{i}")
+
+
+def test_disk_store_keeps_appends_from_every_process(tmp_path):
+    path = str(tmp_path / 'sessions.db')
+    store = DiskSessionStore(path)
+    # Open the parent's connection first, as a preloaded server would
+    store.append('shared', 'user', 'start')
+
+    context = multiprocessing.get_context('fork')
+    workers = [context.Process(target=_append_many, args=(path, worker, 25)) for worker in range(4)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(30)
+        assert process.exitcode == 0
+
+    assert len(store.get_context('shared')) == 1 + 4 * 25
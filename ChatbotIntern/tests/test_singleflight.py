@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from singleflight import AsyncSingleFlight, SingleFlight
+
+
+def run_in_thread(group, key, fn, timeout=None):
+    outcome = {}
+
+    def target():
+        try:
+            outcome['result'] = group.do(key, fn, timeout=timeout)
+        except Exception as e:
+            outcome['error'] = e
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    return thread, outcome
+
+
+def wait_for_in_flight(group):
+    for _ in range(1000):
+        if group.stats()['in_flight']:
+            return
+        time.sleep(0.001)
+    raise AssertionError("leader never started")
+
+
+def wait_for_waiters(group, count):
+    for _ in range(1000):
+        if group.stats()['shared'] >= count:
+            return
+        time.sleep(0.001)
+    raise AssertionError("followers never joined the in-flight call")
+
+
+def test_concurrent_callers_share_one_result():
+    group = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        release.wait(5)
+        return {'answer': 42}
+
+    leader, leader_outcome = run_in_thread(group, 'k', slow)
+    wait_for_in_flight(group)
+    follower, follower_outcome = run_in_thread(group, 'k', slow)
+    wait_for_waiters(group, 1)
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert calls == [1]
+    assert leader_outcome['result'] is follower_outcome['result']
+    assert group.stats() == {'executed': 1, 'shared': 1, 'in_flight': 0}
+
+
+def test_concurrent_callers_share_one_error():
+    group = SingleFlight()
+    release = threading.Event()
+
+    def failing():
+        release.wait(5)
+        raise ValueError("upstream down")
+
+    leader, leader_outcome = run_in_thread(group, 'k', failing)
+    wait_for_in_flight(group)
+    follower, follower_outcome = run_in_thread(group, 'k', failing)
+    wait_for_waiters(group, 1)
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert isinstance(leader_outcome['error'], ValueError)
+    assert follower_outcome['error'] is leader_outcome['error']
+
+
+def test_waiter_times_out_without_stopping_the_call():
+    group = SingleFlight()
+    release = threading.Event()
+
+    leader, leader_outcome = run_in_thread(group, 'k', lambda: release.wait(5) and 'done')
+    wait_for_in_flight(group)
+    with pytest.raises(TimeoutError):
+        group.do('k', lambda: 'not called', timeout=0.01)
+    release.set()
+    leader.join()
+
+    assert leader_outcome['result'] == 'done'
+
+
+def test_nothing_is_cached_after_the_call():
+    group = SingleFlight()
+    assert group.do('k', lambda: 1) == 1
+    assert group.do('k', lambda: 2) == 2
+    assert group.stats()['executed'] == 2
+
+
+def test_async_callers_share_one_result_and_survive_a_waiter_timeout():
+    group = AsyncSingleFlight()
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 'done'
+
+    async def scenario():
+        leader = asyncio.ensure_future(group.do('k', slow))
+        await asyncio.sleep(0)
+        with pytest.raises(asyncio.TimeoutError):
+            await group.do('k', slow, timeout=0.001)
+        follower = await group.do('k', slow)
+        return await leader, follower
+
+    assert asyncio.run(scenario()) == ('done', 'done')
+    assert calls == [1]
@@ -0,0 +1,78 @@
+import json
+import os
+
+from transcript_log import TranscriptLogger
+
+
+def read_records(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_writes_queued_records_in_batches(tmp_path):
+    logger = TranscriptLogger(str(tmp_path / 'transcripts.jsonl'), batch_size=2, flush_interval=0.01).start()
+    for turn in range(5):
+        assert logger.log({'turn': turn})
+    logger.close()
+
+    assert read_records(logger.file_path) == [{'turn': turn} for turn in range(5)]
+    assert logger.stats() == {'queued': 0, 'written': 5, 'dropped': 0}
+
+
+def test_full_queue_drops_and_counts_records(tmp_path):
+    # Not started, so nothing drains the queue
+    logger = TranscriptLogger(str(tmp_path / 'transcripts.jsonl'), max_queue=2)
+    assert logger.log({'turn': 0})
+    assert logger.log({'turn': 1})
+    assert not logger.log({'turn': 2})
+    assert logger.stats() == {'queued': 2, 'written': 0, 'dropped': 1}
+
+
+def test_unserializable_records_are_counted_as_dropped(tmp_path):
+    logger = TranscriptLogger(str(tmp_path / 'transcripts.jsonl'), flush_interval=0.01).start()
+    logger.log({'turn': object()})
+    logger.close()
+    assert logger.stats()['dropped'] == 1
+
+
+def test_rotates_and_keeps_backup_count_files(tmp_path):
+    logger = TranscriptLogger(
+        str(tmp_path / 'transcripts.jsonl'), batch_size=1, flush_interval=0.01, max_bytes=50, backup_count=2
+    ).start()
+    for turn in range(8):
+        logger.log({'turn': turn, 'padding': 'x' * 40})
+    logger.close()
+
+    path = logger.file_path
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(name) for name in [path + '.1', path + '.2'])
+    # Each record filled a file, so the two newest survive, newest first
+    assert read_records(path + '.1')[0]['turn'] == 7
+    assert read_records(path + '.2')[0]['turn'] == 6
+
+
+def test_pid_placeholder_in_path(tmp_path):
+    logger = TranscriptLogger(str(tmp_path / 'worker-{pid}.jsonl'), flush_interval=0.01).start()
+    logger.log({'turn': 0})
+    logger.close()
+    assert os.listdir(tmp_path) == [f'worker-{os.getpid()}.jsonl']
+
+
+def test_forked_child_writes_its_own_file(tmp_path):
+    logger = TranscriptLogger(str(tmp_path / 'transcripts.jsonl'), flush_interval=0.01).start()
+    logger.log({'turn': 'parent'})
+
+    pid = os.fork()
+    if pid == 0:
+        try:
+            logger.log({'turn': 'child'})
+            logger.close()
+            ok = logger.stats() == {'queued': 0, 'written': 1, 'dropped': 0}
+            ok = ok and read_records(logger.file_path) == [{'turn': 'child'}]
+        finally:
+            os._exit(0 if ok else 1)
+    _, status = os.waitpid(pid, 0)
+    logger.close()
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert read_records(tmp_path / f'transcripts.{os.getpid()}.jsonl') == [{'turn': 'parent'}]
+    assert sorted(os.listdir(tmp_path)) == sorted([f'transcripts.{os.getpid()}.jsonl', f'transcripts.{pid}.jsonl'])
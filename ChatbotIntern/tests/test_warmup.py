@@ -0,0 +1,95 @@
+from warmup import AnswerWarmer
+
+
+class FakeResolver:
+    def __init__(self):
+        self.answers = {}
+        self.calls = []
+
+    def __call__(self, question):
+        self.calls.append(question)
+        answer = self.answers.get(question)
+        if isinstance(answer, Exception):
+            raise answer
+        if answer is None:
+            return None
+        return {'intent': 'compensation', 'tier': 'local'}, {'response': answer}
+
+
+def make_warmer(questions, version=lambda: 0):
+    resolver = FakeResolver()
+    return AnswerWarmer(resolver, lambda: questions, version=version), resolver
+
+
+def test_serves_copies_by_normalized_message():
+    warmer, resolver = make_warmer(["Are internships paid?"])
+    resolver.answers["Are internships paid?"] = "Usually."
+    warmer.warm()
+
+    intent_result, response = warmer.get("are INTERNSHIPS paid")
+    assert response == {'response': 'Usually.'}
+    response['cached'] = True
+    assert warmer.get("Are internships paid?")[1] == {'response': 'Usually.'}
+    assert warmer.get("Something else") is None
+    assert len(warmer) == 1
+
+
+def test_duplicate_questions_are_resolved_once():
+    warmer, resolver = make_warmer(["Are internships paid?", "are internships paid"])
+    warmer.warm()
+    assert resolver.calls == ["Are internships paid?"]
+
+
+def test_failed_refresh_keeps_the_previous_answer():
+    warmer, resolver = make_warmer(["Are internships paid?"])
+    resolver.answers["Are internships paid?"] = "Usually."
+    warmer.warm()
+
+    resolver.answers["Are internships paid?"] = RuntimeError("upstream down")
+    warmer.warm()
+    assert warmer.get("Are internships paid?")[1] == {'response': 'Usually.'}
+
+
+def test_questions_dropped_from_the_list_are_forgotten():
+    questions = ["Are internships paid?", "Can I work remotely?"]
+    warmer, resolver = make_warmer(questions)
+    resolver.answers = {question: "Yes." for question in questions}
+    warmer.warm()
+
+    questions.pop()
+    warmer.warm()
+    assert warmer.get("Can I work remotely?") is None
+    assert len(warmer) == 1
+
+
+def test_answers_from_an_older_version_are_not_served():
+    version = [0]
+    warmer, resolver = make_warmer(["Are internships paid?"], version=lambda: version[0])
+    resolver.answers["Are internships paid?"] = "Old answer."
+    warmer.warm()
+
+    version[0] = 1
+    assert warmer.get("Are internships paid?") is None
+    assert len(warmer) == 0
+
+    # A failed refresh does not bring the stale answer back
+    resolver.answers["Are internships paid?"] = None
+    warmer.warm()
+    assert warmer.get("Are internships paid?") is None
+
+    resolver.answers["Are internships paid?"] = "New answer."
+    warmer.warm()
+    assert warmer.get("Are internships paid?")[1] == {'response': 'New answer.'}
+
+
+def test_answer_resolved_across_a_reload_is_tagged_with_the_old_version():
+    version = [0]
+    warmer, resolver = make_warmer(["Are internships paid?"], version=lambda: version[0])
+
+    def resolve_during_reload(question):
+        version[0] = 1
+        return {'intent': 'compensation'}, {'response': 'Built from the old FAQ.'}
+    warmer.resolve = resolve_during_reload
+    warmer.warm()
+
+    assert warmer.get("Are internships paid?") is None
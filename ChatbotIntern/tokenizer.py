@@ -0,0 +1,34 @@
+import re
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Function words that say nothing about the topic. Question words such as
+# "how", "when" and "where" are kept: they help tell timeline and location
+# questions apart.
+STOPWORDS = frozenset([
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'can', 'do', 'does',
+    'for', 'from', 'i', 'if', 'in', 'is', 'it', 'like', 'me', 'my', 'of',
+    'on', 'or', 'should', 'so', 'that', 'the', 'their', 'they', 'this', 'to',
+    'was', 'what', 'will', 'with', 'you', 'your'
+])
+
+
+def normalize_text(text):
+    """
+    Lowercase text and collapse it to space-separated word tokens
+    """
+    return ' '.join(TOKEN_PATTERN.findall(text.lower()))
+
+
+def tokenize(text):
+    """
+    Split text into lowercase terms, dropping stopwords and plural endings
+    """
+    terms = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        terms.append(token)
+    return terms
@@ -0,0 +1,164 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+
+from fork_safety import register_after_fork
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class TranscriptLogger:
+    """
+    Write-behind transcript log backed by rotating JSONL files.
+
+    ``log`` only puts the record on a bounded queue and never blocks. When the
+    queue is full the record is dropped and counted. A background thread
+    drains the queue in batches of up to ``batch_size`` and appends them to
+    the log file. Once the file reaches ``max_bytes`` it is rotated to
+    ``<file>.1`` and older files shift up, keeping ``backup_count`` of them.
+
+    Every process writes its own file, so workers never rotate each other's
+    backups: ``{pid}`` in ``path`` is replaced by the process id, or the id is
+    added before the extension (``transcripts.jsonl`` becomes
+    ``transcripts.<pid>.jsonl``). A child forked from a started logger
+    starts its own writer on a fresh queue.
+    """
+
+    def __init__(self, path, max_queue=10000, batch_size=256, flush_interval=1.0,
+                 max_bytes=64 * 1024 * 1024, backup_count=5):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.written = 0
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self.file_path = None
+        self._file = None
+        self._thread = None
+        self._exit_hook = False
+        register_after_fork(self, in_child=TranscriptLogger._restart_in_child)
+
+    def start(self):
+        if self._thread is None:
+            self.file_path = self._process_path()
+            directory = os.path.dirname(self.file_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._thread = threading.Thread(target=self._run, name='transcript-writer', daemon=True)
+            self._thread.start()
+            if not self._exit_hook:
+                # Flush whatever is still queued when the process exits normally
+                atexit.register(self.close)
+                self._exit_hook = True
+        return self
+
+    def log(self, record):
+        """
+        Queue a record for writing. Returns False if it was dropped.
+        """
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+
+    def close(self, timeout=5.0):
+        """
+        Flush queued records and stop the writer
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return
+        # The stop marker may wait for queue space, but never longer than the timeout
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+    def stats(self):
+        with self._lock:
+            return {'queued': self._queue.qsize(), 'written': self.written, 'dropped': self.dropped}
+
+    def _process_path(self):
+        pid = str(os.getpid())
+        if '{pid}' in self.path:
+            return self.path.replace('{pid}', pid)
+        root, extension = os.path.splitext(self.path)
+        return f"{root}.{pid}{extension}"
+
+    def _restart_in_child(self):
+        if self._thread is None:
+            return
+        # The writer thread did not survive the fork; records still queued belong to the parent
+        self._queue = queue.Queue(maxsize=self._queue.maxsize)
+        self._lock = threading.Lock()
+        self._file = None
+        self.written = 0
+        self.dropped = 0
+        self._thread = None
+        self.start()
+
+    def _run(self):
+        while True:
+            try:
+                record = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = []
+            stopping = record is _STOP
+            if not stopping:
+                batch.append(record)
+            while len(batch) < self.batch_size and not stopping:
+                try:
+                    record = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is _STOP:
+                    stopping = True
+                else:
+                    batch.append(record)
+
+            if batch:
+                self._write(batch)
+            if stopping:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                return
+
+    def _write(self, batch):
+        try:
+            if self._file is None:
+                self._file = open(self.file_path, 'a', encoding='utf-8')
+            self._file.write(''.join(json.dumps(record) + '\n' for record in batch))
+            self._file.flush()
+            with self._lock:
+                self.written += len(batch)
+            if self._file.tell() >= self.max_bytes:
+                self._rotate()
+        except (OSError, TypeError, ValueError) as e:
+            logger.error("Transcript write failed: %s", e)
+            with self._lock:
+                self.dropped += len(batch)
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.file_path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.file_path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.file_path, f"{self.file_path}.1")
+        else:
+            os.remove(self.file_path)
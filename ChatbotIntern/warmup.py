@@ -0,0 +1,134 @@
+import logging
+import threading
+import time
+
+from fork_safety import register_after_fork
+from tokenizer import normalize_text
+
+logger = logging.getLogger(__name__)
+
+
+class AnswerWarmer:
+    """
+    Precomputed answers for a list of canonical questions.
+
+    A background thread resolves every question returned by ``questions()``
+    through ``resolve(question)`` and repeats this every ``refresh_interval``
+    seconds. ``resolve`` returns ``(intent_result, response)``, or None when
+    there is no answer worth keeping. Answers are looked up by normalized
+    message text. Nothing runs on the caller's thread, so startup is not
+    delayed. Until a question has been warmed, lookups for it just miss.
+
+    Each answer is tagged with ``version()`` as it was when resolving began,
+    e.g. the knowledge base version. Answers from an older version are never
+    served, even when their refresh fails.
+
+    Warming stops in a process once it forks: it is taken to be a pre-fork
+    master, and each child warms its own answers on a new thread.
+    """
+
+    def __init__(self, resolve, questions, refresh_interval=3600, version=lambda: 0):
+        self.resolve = resolve
+        self.questions = questions
+        self.refresh_interval = refresh_interval
+        self.version = version
+        self.last_refresh = None
+        self._answers = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._closed = False
+        register_after_fork(
+            self,
+            in_child=AnswerWarmer._restart_in_child,
+            in_parent=AnswerWarmer._pause
+        )
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='answer-warmer', daemon=True)
+            self._thread.start()
+        return self
+
+    def refresh(self):
+        """
+        Ask the background thread to re-resolve all questions now
+        """
+        self._wake.set()
+
+    def close(self):
+        self._closed = True
+        self._pause()
+
+    def get(self, message):
+        """
+        Return copies of the warmed (intent_result, response) for a message, or None
+        """
+        with self._lock:
+            entry = self._answers.get(normalize_text(message))
+        if entry is None or entry[0] != self.version():
+            return None
+        _, intent_result, response = entry
+        return dict(intent_result), dict(response)
+
+    def warm(self):
+        """
+        Resolve every canonical question once, replacing answers as they complete
+        """
+        questions = self.questions()
+        answers = {}
+        for question in questions:
+            if self._stop.is_set():
+                return
+            key = normalize_text(question)
+            if key in answers:
+                continue
+            version = self.version()
+            try:
+                resolved = self.resolve(question)
+            except Exception as e:
+                logger.warning("Warm-up failed for %r: %s", question, e)
+                resolved = None
+            answers[key] = resolved
+            with self._lock:
+                if resolved is None:
+                    # Keep the previous answer; it is still served if its version is current
+                    continue
+                self._answers[key] = (version, *resolved)
+
+        # Forget questions that are no longer canonical (e.g. removed from the FAQ)
+        with self._lock:
+            for key in set(self._answers) - set(answers):
+                del self._answers[key]
+        self.last_refresh = time.time()
+        logger.info("Warmed %d of %d canonical questions", sum(1 for value in answers.values() if value), len(answers))
+
+    def stats(self):
+        return {'warmed': len(self), 'last_refresh': self.last_refresh}
+
+    def __len__(self):
+        version = self.version()
+        with self._lock:
+            return sum(1 for entry in self._answers.values() if entry[0] == version)
+
+    def _pause(self):
+        self._stop.set()
+        self._wake.set()
+
+    def _restart_in_child(self):
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        if self._thread is not None and not self._closed:
+            self._thread = None
+            self.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                self.warm()
+            except Exception as e:
+                logger.error("Warm-up pass failed: %s", e)
+            self._wake.wait(self.refresh_interval)